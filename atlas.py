@@ -0,0 +1,124 @@
+import hashlib
+import json
+import os
+
+import pygame
+
+# Sprite atlas for the procedural sprites. Every sprite is drawn once, packed
+# into a single surface and handed out as subsurfaces of it, converted to the
+# display's pixel format so blits need no per-pixel conversion.
+#
+# With a cache directory the packed atlas is saved as PNG plus a JSON layout,
+# named after a hash of the sprite specs (names, generator code and
+# arguments). Later startups load that file instead of redrawing; changing
+# any generator or argument changes the hash and rebuilds it.
+
+ATLAS_WIDTH = 512
+PADDING = 1  # Keeps scaled subsurfaces from bleeding into their neighbours
+PREFIX = "atlas-"
+
+def spec_hash(specs):
+    # specs: [(name, generator, args)]
+    digest = hashlib.sha1()
+    for name, generator, args in specs:
+        code = generator.__code__
+        digest.update(name.encode())
+        digest.update(generator.__qualname__.encode())
+        digest.update(code.co_code)
+        digest.update(repr(code.co_consts).encode())
+        digest.update(repr(args).encode())
+    return digest.hexdigest()[:16]
+
+def pack(sizes, width=ATLAS_WIDTH):
+    # Shelf packing, tallest first. Returns {name: (x, y)} and the height used
+    order = sorted(sizes, key=lambda name: (-sizes[name][1], name))
+    positions = {}
+    x = y = shelf_height = 0
+    for name in order:
+        w, h = sizes[name]
+        if x + w > width:
+            x = 0
+            y += shelf_height + PADDING
+            shelf_height = 0
+        positions[name] = (x, y)
+        x += w + PADDING
+        shelf_height = max(shelf_height, h)
+    return positions, y + shelf_height
+
+class SpriteAtlas:
+    def __init__(self, surface, layout):
+        self.surface = surface
+        self.layout = layout  # {name: (x, y, w, h)}
+        self.sprites = {name: surface.subsurface(rect) for name, rect in layout.items()}
+
+    def __getitem__(self, name):
+        return self.sprites[name]
+
+    @classmethod
+    def build(cls, specs):
+        images = {name: generator(*args) for name, generator, args in specs}
+        sizes = {name: image.get_size() for name, image in images.items()}
+        positions, height = pack(sizes)
+        surface = pygame.Surface((ATLAS_WIDTH, max(1, height)), pygame.SRCALPHA)
+        layout = {}
+        for name, image in images.items():
+            # Max-blend onto the cleared atlas copies pixels and alpha exactly
+            surface.blit(image, positions[name], special_flags=pygame.BLEND_RGBA_MAX)
+            layout[name] = positions[name] + sizes[name]
+        return cls(surface, layout)
+
+    @classmethod
+    def load(cls, image_path, layout_path):
+        with open(layout_path) as f:
+            layout = {name: tuple(rect) for name, rect in json.load(f).items()}
+        return cls(pygame.image.load(image_path), layout)
+
+    def save(self, image_path, layout_path):
+        # Write to temporary names first so a crash never leaves half a cache
+        image_tmp = image_path + ".tmp.png"
+        layout_tmp = layout_path + ".tmp"
+        pygame.image.save(self.surface, image_tmp)
+        with open(layout_tmp, "w") as f:
+            json.dump(self.layout, f)
+        os.replace(image_tmp, image_path)
+        os.replace(layout_tmp, layout_path)
+
+    def convert(self):
+        # Match the display format; needs a display mode to be set
+        if pygame.display.get_surface() is None:
+            return self
+        return SpriteAtlas(self.surface.convert_alpha(), self.layout)
+
+def remove_stale(cache_dir, keep):
+    for filename in os.listdir(cache_dir):
+        if filename.startswith(PREFIX) and not filename.startswith(keep):
+            try:
+                os.remove(os.path.join(cache_dir, filename))
+            except OSError:
+                pass
+
+def load_atlas(specs, cache_dir=None):
+    # Build the atlas for specs, going through the on-disk cache if given.
+    # The cache is best effort: unreadable or unwritable files just mean the
+    # sprites are drawn again.
+    if cache_dir is None:
+        return SpriteAtlas.build(specs).convert()
+
+    name = PREFIX + spec_hash(specs)
+    image_path = os.path.join(cache_dir, name + ".png")
+    layout_path = os.path.join(cache_dir, name + ".json")
+    try:
+        atlas = SpriteAtlas.load(image_path, layout_path)
+        if set(atlas.layout) == {spec[0] for spec in specs}:
+            return atlas.convert()
+    except (OSError, ValueError, KeyError, TypeError, pygame.error):
+        pass
+
+    atlas = SpriteAtlas.build(specs)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        atlas.save(image_path, layout_path)
+        remove_stale(cache_dir, name)
+    except (OSError, pygame.error):
+        pass
+    return atlas.convert()
@@ -0,0 +1,111 @@
+import hashlib
+import os
+import wave
+
+import numpy as np
+import pygame
+from pygame import mixer
+
+# Sound effects: sample buffers synthesized with NumPy, cached as WAV files,
+# and a voice manager that plays them on a fixed set of reserved channels.
+
+SAMPLE_BYTES = 8000
+# Mixer formats whose raw bytes are also valid WAV sample data
+WAV_FORMATS = {8: 1, -16: 2}  # mixer sample size -> bytes per sample
+
+def sawtooth(step, length=SAMPLE_BYTES):
+    # Raw mixer bytes ramping by step and wrapping at 256
+    return ((np.arange(length, dtype=np.uint32) * step) % 256).astype(np.uint8).tobytes()
+
+# name -> (generator, arguments, volume, voices)
+SOUND_SPECS = {
+    "shoot": (sawtooth, (1,), 0.2, 2),
+    "explosion": (sawtooth, (10,), 0.3, 3),
+    "powerup": (sawtooth, (20,), 0.4, 1),
+}
+
+def cache_name(name, generator, args, mix_format):
+    digest = hashlib.sha1()
+    digest.update(generator.__code__.co_code)
+    digest.update(repr(generator.__code__.co_consts).encode())
+    digest.update(repr((args, mix_format)).encode())
+    return f"{name}-{digest.hexdigest()[:16]}.wav"
+
+def write_wav(path, data, frequency, sample_bytes, channels):
+    tmp = path + ".tmp"
+    with wave.open(tmp, "wb") as f:
+        f.setnchannels(channels)
+        f.setsampwidth(sample_bytes)
+        f.setframerate(frequency)
+        f.writeframes(data)
+    os.replace(tmp, path)
+
+def load_sound(name, generator, args, cache_dir=None):
+    # Load the cached WAV for this spec and mixer format, or synthesize the
+    # buffer (and try to cache it). The cache only applies to mixer formats
+    # a WAV file stores byte for byte.
+    mix_format = mixer.get_init()
+    frequency, size, channels = mix_format
+    path = None
+    if cache_dir is not None and size in WAV_FORMATS:
+        path = os.path.join(cache_dir, cache_name(name, generator, args, mix_format))
+        if os.path.exists(path):
+            try:
+                return mixer.Sound(path)
+            except pygame.error:
+                pass
+
+    data = generator(*args)
+    if path is not None:
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            write_wav(path, data, frequency, WAV_FORMATS[size], channels)
+        except (OSError, wave.Error):
+            pass
+    return mixer.Sound(buffer=data)
+
+def load_sounds(cache_dir=None, specs=SOUND_SPECS):
+    sounds = {}
+    for name, (generator, args, volume, voices) in specs.items():
+        sound = load_sound(name, generator, args, cache_dir)
+        sound.set_volume(volume)
+        sounds[name] = sound
+    return sounds
+
+class VoiceManager:
+    # Each sound gets its own reserved channels (its voice cap), so effects
+    # never steal each other's channels and a burst of one sound cannot pile
+    # up unbounded mixing work. play() also drops repeats within one frame.
+    def __init__(self, sounds, specs=SOUND_SPECS):
+        self.sounds = sounds
+        total = sum(spec[3] for spec in specs.values())
+        if mixer.get_num_channels() < total:
+            mixer.set_num_channels(total)
+        mixer.set_reserved(total)  # Keep Sound.play() elsewhere off these
+
+        self.channels = {}
+        self.started = {}  # Frame each channel last started, to steal the oldest
+        first = 0
+        for name, spec in specs.items():
+            self.channels[name] = [mixer.Channel(i) for i in range(first, first + spec[3])]
+            self.started[name] = [0] * spec[3]
+            first += spec[3]
+        self.frame = 0
+
+    def play(self, names):
+        # Play this frame's sound events, once per distinct name
+        self.frame += 1
+        played = set()
+        for name in names:
+            if name in played:
+                continue
+            played.add(name)
+            channels = self.channels[name]
+            started = self.started[name]
+            for i, channel in enumerate(channels):
+                if not channel.get_busy():
+                    break
+            else:
+                i = started.index(min(started))
+            channels[i].play(self.sounds[name])
+            started[i] = self.frame
@@ -0,0 +1,38 @@
+import random
+import time
+
+from bullets import BulletPool
+from world import WIDTH, HEIGHT
+
+# Per-frame move + cull cost of the structure-of-arrays BulletPool at
+# various live bullet counts. Bullets that leave the screen are respawned so
+# the live count stays roughly constant.
+#
+#   python -m benchmarks.bullets
+
+BULLET_COUNTS = [100, 1000, 10000]
+FRAMES = 200
+
+def fill(pool, count):
+    for _ in range(count - pool.count):
+        pool.spawn(random.uniform(0, WIDTH), random.uniform(0, HEIGHT),
+                   random.uniform(-1, 1), random.uniform(-1, 1), speed=2)
+
+def main():
+    random.seed(0)
+    print(f"median ms per frame over {FRAMES} frames")
+    print(f"{'bullets':>8} {'move+cull':>10}")
+    for count in BULLET_COUNTS:
+        pool = BulletPool(count)
+        samples = []
+        for _ in range(FRAMES):
+            fill(pool, count)
+            start = time.perf_counter()
+            pool.move()
+            pool.cull(WIDTH, HEIGHT)
+            samples.append((time.perf_counter() - start) * 1000)
+        samples.sort()
+        print(f"{count:>8} {samples[len(samples) // 2]:>10.3f}")
+
+if __name__ == "__main__":
+    main()
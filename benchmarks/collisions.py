@@ -0,0 +1,82 @@
+import math
+import random
+import time
+
+from benchmarks.enemies import ListEnemy
+from world import GameWorld, WIDTH, HEIGHT
+
+# Frame-time curve for enemy/bullet collision with 50 enemies and a growing
+# number of bullets, comparing the original nested O(E*B) loop over Bullet
+# objects ("before") against the spatial-hash broadphase in GameWorld
+# ("after").
+#
+#   python -m benchmarks.collisions
+
+ENEMY_COUNT = 50
+BULLET_COUNTS = [0, 250, 500, 1000, 1500, 2000]
+REPEATS = 20
+
+class ListBullet:
+    # Stand-in for the old per-object Bullet
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+        self.size = 5
+
+def build_scene(bullet_count, seed):
+    random.seed(seed)
+    world = GameWorld()
+    world.player.x = -1000  # Keep the player out of the way
+    enemies = world.enemies
+    objects = []
+    for _ in range(ENEMY_COUNT):
+        i = enemies.spawn(random.randint(0, 2), random, WIDTH)
+        enemies.y[i] = random.uniform(0, HEIGHT)
+        enemies.health[i] = 10 ** 6  # Survive the whole frame so both paths do the same work
+        objects.append(ListEnemy(int(enemies.type[i]), enemies.x[i], enemies.y[i],
+                                 enemies.dx[i], enemies.dy[i]))
+    bullets = []
+    for _ in range(bullet_count):
+        x = random.uniform(0, WIDTH)
+        y = random.uniform(0, HEIGHT)
+        world.bullets.spawn(x, y, 0, -1)
+        bullets.append(ListBullet(x, y))
+    return world, objects, bullets
+
+def collide_naive(world, enemies, bullets):
+    # The pre-broadphase loop over per-object enemies, kept as the baseline
+    player = world.player
+    for enemy in enemies[:]:
+        enemy.move(player)
+        for bullet in bullets[:]:
+            if math.sqrt((enemy.x - bullet.x)**2 + (enemy.y - bullet.y)**2) < (enemy.width / 2 + bullet.size):
+                bullets.remove(bullet)
+                enemy.hit(10)
+
+def collide_grid(world, enemies, bullets):
+    pool = world.bullets
+    world.bullet_grid.rebuild(pool.x[:pool.count], pool.y[:pool.count])
+    world.update_enemies()
+    pool.compact()
+
+def measure(collide, bullet_count):
+    samples = []
+    for seed in range(REPEATS):
+        world, enemies, bullets = build_scene(bullet_count, seed)
+        start = time.perf_counter()
+        collide(world, enemies, bullets)
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return samples[len(samples) // 2]
+
+def main():
+    print(f"{ENEMY_COUNT} enemies, median ms per frame over {REPEATS} scenes")
+    print(f"{'bullets':>8} {'before':>10} {'after':>10} {'speedup':>8}")
+    for bullet_count in BULLET_COUNTS:
+        before = measure(collide_naive, bullet_count)
+        after = measure(collide_grid, bullet_count)
+        speedup = before / after if after else float("inf")
+        print(f"{bullet_count:>8} {before:>10.3f} {after:>10.3f} {speedup:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+import random
+import time
+
+from enemies import EnemyArray, ENEMY_SIZE
+from world import WIDTH, HEIGHT
+
+# Per-tick enemy movement cost: the original per-object Enemy.move loop
+# ("before") against the type-grouped NumPy kernels of EnemyArray ("after").
+#
+#   python -m benchmarks.enemies
+
+ENEMY_COUNTS = [10, 100, 1000, 5000]
+TICKS = 100
+
+class ListEnemy:
+    # Stand-in for the old per-object Enemy, kept as the baseline
+    def __init__(self, type_, x, y, dx, dy):
+        self.type = type_
+        self.width = ENEMY_SIZE
+        self.height = ENEMY_SIZE
+        self.x = x
+        self.y = y
+        self.prev_x = x
+        self.prev_y = y
+        self.dx = dx
+        self.dy = dy
+        self.health = 10 + 10 * type_
+        self.zigzag_counter = 0
+        self.tracking = type_ == 2
+
+    def move(self, player):
+        self.prev_x = self.x
+        self.prev_y = self.y
+        if self.type == 1:
+            self.zigzag_counter += 1
+            if self.zigzag_counter > 30:
+                self.dx *= -1
+                self.zigzag_counter = 0
+        elif self.type == 2 and self.tracking:
+            if player.x > self.x:
+                self.dx = min(self.dx + 0.1, 2)
+            else:
+                self.dx = max(self.dx - 0.1, -2)
+        if self.x < self.width or self.x > WIDTH - self.width:
+            self.dx *= -1
+        self.x += self.dx
+        self.y += self.dy
+
+    def hit(self, damage):
+        self.health -= damage
+        return self.health <= 0
+
+def spawn_scene(count, seed):
+    # The same enemies as an EnemyArray and as ListEnemy objects
+    rng = random.Random(seed)
+    enemies = EnemyArray()
+    objects = []
+    for i in range(count):
+        index = enemies.spawn(i % 3, rng, WIDTH)
+        enemies.y[index] = rng.uniform(0, HEIGHT)
+        objects.append(ListEnemy(i % 3, enemies.x[index], enemies.y[index],
+                                 enemies.dx[index], enemies.dy[index]))
+    return enemies, objects
+
+class Target:
+    x = WIDTH / 2
+
+def main():
+    print(f"median ms per tick over {TICKS} ticks")
+    print(f"{'enemies':>8} {'before':>10} {'after':>10} {'speedup':>8}")
+    player = Target()
+    for count in ENEMY_COUNTS:
+        enemies, objects = spawn_scene(count, 0)
+        before = []
+        after = []
+        for _ in range(TICKS):
+            start = time.perf_counter()
+            for enemy in objects:
+                enemy.move(player)
+            before.append((time.perf_counter() - start) * 1000)
+            start = time.perf_counter()
+            enemies.move(player.x, WIDTH)
+            after.append((time.perf_counter() - start) * 1000)
+        before.sort()
+        after.sort()
+        b = before[TICKS // 2]
+        a = after[TICKS // 2]
+        print(f"{count:>8} {b:>10.3f} {a:>10.3f} {b / a:>7.1f}x")
+
+        # Both paths must agree
+        assert all(abs(enemy.x - x) < 1e-9 for enemy, x in zip(objects, enemies.x.tolist()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+import argparse
+
+from netplay import run_loopback
+
+# Co-op sync cost over loopback under simulated network conditions: wire
+# bytes per tick (one client), host time per tick spent simulating,
+# capturing and encoding, and a check that the client rebuilt every state
+# it received exactly.
+#
+#   python -m benchmarks.netplay
+#   python -m benchmarks.netplay --ticks 3600 --score 900   # into the boss fight
+
+CONDITIONS = [
+    (0.0, 0, 0),
+    (0.02, 30, 5),
+    (0.1, 80, 20),
+    (0.25, 150, 50),
+]
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure co-op state sync over loopback")
+    parser.add_argument("--ticks", type=int, default=1800)
+    parser.add_argument("--score", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'loss':>5} {'latency':>8} {'B/tick':>7} {'p95':>5} {'kbit/s':>7} {'ratio':>6} "
+          f"{'full':>5} {'sim ms':>7} {'enc ms':>7} {'lost':>5} {'ok':>3}")
+    for loss, latency, jitter in CONDITIONS:
+        report = run_loopback(args.ticks, loss, latency, jitter, score=args.score)
+        host = report["host"]
+        phases = host["tick_ms"]
+        sent = host["bytes_per_tick"]
+        encode = phases["capture"]["mean"] + phases["encode"]["mean"]
+        ok = "yes" if not report["mismatches"] else "NO"
+        print(f"{loss:>5.2f} {latency:>5}+-{jitter:<2} {sent['mean']:>7.0f} {sent['p95']:>5.0f} "
+              f"{host['kbit_per_s']:>7.1f} {host['compression']:>6.1f} {host['full_states']:>5} "
+              f"{phases['sim']['mean']:>7.3f} {encode:>7.3f} {report['client']['states_missing']:>5} {ok:>3}")
+
+if __name__ == "__main__":
+    main()
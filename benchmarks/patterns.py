@@ -0,0 +1,88 @@
+import math
+import time
+
+import numpy as np
+
+from bullets import BulletPool, OWNER_BOSS
+from particles import ParticleSystem
+from patterns import attack
+from world import BOSS_ATTACKS, HELL_ATTACKS, HELL_MAX_DENSITY, BOSS_BULLET_SPEED
+
+# Cost of firing boss volleys: the old per-projectile Boss.shoot loop
+# (trigonometry and one spawn per bullet, kept here as a reference) against
+# compiled patterns fired as one batch. The bullet hell row fires every
+# pattern at full density.
+#
+#   python -m benchmarks.patterns
+
+VOLLEYS = 3000
+BOSS = (400.0, 140.0)
+PLAYER = (300.0, 500.0)
+
+def reference_shoot(pattern, x, y, player):
+    # Boss.shoot before patterns.py
+    bullets = []
+    if pattern == 0:  # Spread shot
+        for angle in range(-60, 61, 20):
+            rad = math.radians(angle + 90)
+            bullets.append((x, y, math.cos(rad), math.sin(rad)))
+    elif pattern == 1:  # Target player
+        dx = (player[0] - x) / math.sqrt((player[0] - x)**2 + (player[1] - y)**2)
+        dy = (player[1] - y) / math.sqrt((player[0] - x)**2 + (player[1] - y)**2)
+        for offset in (0, -30, 30):
+            bullets.append((x + offset, y, dx, dy))
+    elif pattern == 2:  # Spiral
+        for i in range(8):
+            rad = math.radians(i * 45)
+            bullets.append((x, y, math.cos(rad), math.sin(rad)))
+    return bullets
+
+def fire_reference(volley, pool, particles):
+    for x, y, dx, dy in reference_shoot(volley % 3, *BOSS, PLAYER):
+        pool.spawn(x, y, dx, dy, speed=BOSS_BULLET_SPEED, owner=OWNER_BOSS)
+        particles.add_particle(x, y, (255, 100, 100), 3, 10, dx * 0.5, dy * 0.5)
+
+def compiled_fire(names, density):
+    patterns = [attack(name, density) for name in names]
+    dx = PLAYER[0] - BOSS[0]
+    dy = PLAYER[1] - BOSS[1]
+    distance = math.sqrt(dx * dx + dy * dy)
+    aim = (dx / distance, dy / distance)
+
+    def fire(volley, pool, particles):
+        pattern = patterns[volley % len(patterns)]
+        x, y, dx, dy = pattern.volley(*BOSS, volley, aim)
+        pool.spawn_many(x, y, dx, dy, speed=BOSS_BULLET_SPEED, owner=OWNER_BOSS)
+        n = pattern.count
+        particles.add_particles(x, y, (255, 100, 100), np.full(n, 3), np.full(n, 10), dx * 0.5, dy * 0.5)
+    return fire
+
+def measure(fire):
+    # Microseconds per volley, and bullets fired
+    pool = BulletPool()
+    particles = ParticleSystem()
+    fired = 0
+    start = time.perf_counter()
+    for volley in range(VOLLEYS):
+        if pool.count > pool.capacity // 2:
+            pool.clear()
+        before = pool.count
+        fire(volley, pool, particles)
+        fired += pool.count - before
+    elapsed = time.perf_counter() - start
+    return elapsed / VOLLEYS * 1e6, fired
+
+def main():
+    rows = [
+        ("boss, per bullet", fire_reference),
+        ("boss, compiled", compiled_fire(BOSS_ATTACKS, 1)),
+        ("bullet hell", compiled_fire(HELL_ATTACKS, HELL_MAX_DENSITY)),
+    ]
+    print(f"{'':>18} {'us/volley':>10} {'us/bullet':>10} {'bullets/volley':>15}")
+    for name, fire in rows:
+        per_volley, fired = measure(fire)
+        per_bullet = per_volley * VOLLEYS / fired
+        print(f"{name:>18} {per_volley:>10.2f} {per_bullet:>10.3f} {fired / VOLLEYS:>15.1f}")
+
+if __name__ == "__main__":
+    main()
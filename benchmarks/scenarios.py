@@ -0,0 +1,310 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+from pipeline import Pipeline
+from sweep import weave
+from timing import PhaseTimer, clock, stats
+from world import GameWorld, Boss, WIDTH, HEIGHT, TICK_MS
+
+# Scripted performance scenarios, run headlessly and/or through the
+# renderer, reporting per-phase timings as JSON so runs can be compared
+# across commits.
+#
+#   python -m benchmarks.scenarios                     # every scenario, both modes
+#   python -m benchmarks.scenarios boss --mode headless --out boss.json
+#   python -m benchmarks.scenarios boss --mode rendered --mode pipelined
+#
+# Rendered modes open a window unless SDL_VIDEODRIVER is set (use "dummy"
+# to measure software blits only). "rendered" updates and draws in turn,
+# "pipelined" overlaps them on two threads (pipeline.py). Both report
+# frame_ms as wall-clock time per presented frame and latency_ms from the
+# inputs of a tick being read to its frame being presented.
+
+SEED = 1234
+FOREVER = 10 ** 12  # Health or interval (ms) that never runs out
+
+def make_invincible(world):
+    # Scenarios measure load, not survival. Nothing is scheduled to end it.
+    world.player.invincible = True
+
+class Scenario:
+    name = None
+    ticks = 600
+
+    def setup(self, world):
+        make_invincible(world)
+
+    def before_tick(self, world, tick):
+        # Scripted inputs for this tick; may also poke world state
+        return 0
+
+    def make_world(self):
+        world = GameWorld(SEED)
+        self.setup(world)
+        return world
+
+    def report(self):
+        # Extra scenario-specific numbers for the JSON report
+        return {}
+
+class Idle(Scenario):
+    name = "idle"
+
+class Swarm(Scenario):
+    name = "swarm"
+    count = 200
+
+    def setup(self, world):
+        super().setup(world)
+        world.set_spawn_rate(FOREVER)
+        self.top_up(world)
+
+    def top_up(self, world):
+        rng = world.rng
+        enemies = world.enemies
+        while len(enemies) < self.count:
+            i = enemies.spawn(len(enemies) % 3, rng, WIDTH)
+            enemies.y[i] = rng.uniform(0, HEIGHT - 100)
+            enemies.health[i] = FOREVER
+
+    def before_tick(self, world, tick):
+        self.top_up(world)
+        return weave(tick)
+
+class Horde(Swarm):
+    # Endless-mode scale
+    name = "horde"
+    count = 2000
+
+class BossSpiral(Scenario):
+    name = "boss"
+
+    def setup(self, world):
+        super().setup(world)
+        world.level = 10
+        world.score = 10 * 1000
+        boss = Boss(10)
+        boss.y = 100
+        boss.health = boss.max_health = FOREVER
+        world.start_boss(boss)
+
+    def before_tick(self, world, tick):
+        # Holding the pattern makes every volley the spiral
+        world.boss.pattern = 2
+        return weave(tick)
+
+class BulletHell(Scenario):
+    # Bullet hell at full intensity from the first volley, against a boss
+    # that never dies
+    name = "hell"
+
+    def make_world(self):
+        world = GameWorld(SEED, bullet_hell=True)
+        self.setup(world)
+        return world
+
+    def setup(self, world):
+        super().setup(world)
+        world.hell_ramp_ticks = 1
+        self.peak = 0
+
+    def before_tick(self, world, tick):
+        if world.boss:
+            world.boss.health = FOREVER
+        self.peak = max(self.peak, len(world.enemy_bullets))
+        return weave(tick)
+
+    def report(self):
+        return {"peak_enemy_bullets": self.peak}
+
+class Particles(Scenario):
+    name = "particles"
+    count = 5000
+
+    def make_world(self):
+        world = GameWorld(SEED, max_particles=8192)
+        self.setup(world)
+        return world
+
+    def setup(self, world):
+        super().setup(world)
+        world.set_spawn_rate(FOREVER)
+
+    def before_tick(self, world, tick):
+        missing = self.count - len(world.particle_system)
+        while missing > 0:
+            burst = min(missing, 100)
+            x = world.rng.uniform(0, WIDTH)
+            y = world.rng.uniform(0, HEIGHT)
+            world.burst(x, y, burst, (1, 3), (255, 200, 50), (2, 5), (20, 40))
+            missing -= burst
+        return 0
+
+class ShotSpam(Scenario):
+    name = "spam"
+
+    def setup(self, world):
+        super().setup(world)
+        world.player.rapid_fire = True
+        world.player.multi_shot = True  # No expiry scheduled
+
+    def before_tick(self, world, tick):
+        return weave(tick)
+
+SCENARIOS = {scenario.name: scenario for scenario in (Idle, Swarm, Horde, BossSpiral, BulletHell, Particles, ShotSpam)}
+MODE_GROUPS = {"both": ["headless", "rendered"], "all": ["headless", "rendered", "pipelined"]}
+
+def run_headless(scenario):
+    world = scenario.make_world()
+    timer = PhaseTimer()
+    world.timer = timer
+    for tick in range(scenario.ticks):
+        inputs = scenario.before_tick(world, tick)
+        world.tick(inputs)
+        timer.end_frame()
+    return timer.summary()
+
+def run_rendered(scenario, renderer):
+    world = scenario.make_world()
+    timer = PhaseTimer()
+    world.timer = timer
+    walls = []
+    last = clock()
+    for tick in range(scenario.ticks):
+        inputs = scenario.before_tick(world, tick)
+        world.tick(inputs)
+
+        start = clock()
+        renderer.update(world)
+        renderer.draw(world, 1.0)
+        timer.add("draw", clock() - start)
+
+        start = clock()
+        renderer.present()
+        now = clock()
+        timer.add("flip", now - start)
+        timer.end_frame()
+        walls.append(now - last)
+        last = now
+    summary = timer.summary()
+    # One frame in flight: each frame shows the inputs read at its start
+    summary["frame_ms"] = summary["latency_ms"] = stats(walls)
+    return summary
+
+def run_pipelined(scenario, renderer):
+    # The same frames as run_rendered, with the next tick and its capture
+    # running on the simulation thread while this one draws
+    world = scenario.make_world()
+    timer = PhaseTimer()  # Simulation phases, on the simulation thread
+    world.timer = timer
+    frames = PhaseTimer()  # This thread, plus the simulation thread's total
+    pipeline = Pipeline(renderer)
+    walls = []
+    latencies = []
+    submitted = clock()
+    pipeline.submit(world, scenario.before_tick(world, 0), TICK_MS)
+    last = clock()
+    for tick in range(1, scenario.ticks + 1):
+        frame, _, seconds = pipeline.collect()
+        timer.end_frame()
+        frames.add("simulation", seconds)
+        shown = submitted
+        if tick < scenario.ticks:
+            submitted = clock()
+            pipeline.submit(world, scenario.before_tick(world, tick), TICK_MS)
+
+        start = clock()
+        renderer.draw_frame(frame)
+        frames.add("draw", clock() - start)
+
+        start = clock()
+        renderer.present()
+        now = clock()
+        frames.add("flip", now - start)
+        frames.end_frame()
+        walls.append(now - last)
+        latencies.append(now - shown)
+        last = now
+    pipeline.close()
+
+    summary = timer.summary()
+    summary["phases_ms"].update(frames.summary()["phases_ms"])
+    summary["frame_ms"] = stats(walls)
+    summary["latency_ms"] = stats(latencies)
+    return summary
+
+def make_renderer():
+    import pygame
+    from render import Renderer
+
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    return Renderer(screen)
+
+def git_revision():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def main():
+    parser = argparse.ArgumentParser(description="Run scripted performance scenarios")
+    parser.add_argument("scenarios", nargs="*",
+                        help=f"scenarios to run: {', '.join(SCENARIOS)} (default: all)")
+    parser.add_argument("--mode", action="append", choices=["headless", "rendered", "pipelined", "both", "all"],
+                        help="repeatable; both = headless and rendered (default), all adds pipelined")
+    parser.add_argument("--ticks", type=int, default=None, help="override ticks per scenario")
+    parser.add_argument("--out", help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    names = args.scenarios or list(SCENARIOS)
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario: {', '.join(unknown)}")
+    modes = []
+    for mode in args.mode or ["both"]:
+        for name in MODE_GROUPS.get(mode, [mode]):
+            if name not in modes:
+                modes.append(name)
+    renderer = make_renderer() if modes != ["headless"] else None
+
+    # Pipelining only pays off with a core for each thread
+    report = {"revision": git_revision(), "seed": SEED, "cpus": os.cpu_count(), "results": []}
+    for name in names:
+        for mode in modes:
+            scenario = SCENARIOS[name]()
+            if args.ticks:
+                scenario.ticks = args.ticks
+            if mode == "headless":
+                summary = run_headless(scenario)
+            elif mode == "rendered":
+                summary = run_rendered(scenario, renderer)
+            else:
+                summary = run_pipelined(scenario, renderer)
+            summary.update(scenario.report())
+            summary.update({"scenario": name, "mode": mode})
+            report["results"].append(summary)
+            frame = summary["frame_ms"]
+            line = (f"{name:>10} {mode:>9}  p50 {frame['p50']:7.3f}  p95 {frame['p95']:7.3f}  "
+                    f"p99 {frame['p99']:7.3f} ms")
+            if "latency_ms" in summary:
+                latency = summary["latency_ms"]
+                line += f"  latency p50 {latency['p50']:7.3f}  p95 {latency['p95']:7.3f} ms"
+            print(line, file=sys.stderr)
+
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+if __name__ == "__main__":
+    main()
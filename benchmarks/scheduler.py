@@ -0,0 +1,63 @@
+import random
+import time
+
+from scheduler import Scheduler
+
+# Per-tick cost of timers: checking every pending timer each tick ("poll",
+# how GameWorld used to run its timers) against the heap scheduler, which
+# only touches the events that are due.
+#
+#   python -m benchmarks.scheduler
+
+TIMER_COUNTS = [10, 1000, 100000]
+TICKS = 600
+MAX_DELAY = 3600  # Timers fire within a minute and re-arm
+
+class PolledTimer:
+    __slots__ = ("due", "fired")
+
+    def __init__(self, due):
+        self.due = due
+        self.fired = 0
+
+def poll(count, rng):
+    timers = [PolledTimer(rng.randint(1, MAX_DELAY)) for _ in range(count)]
+    start = time.perf_counter()
+    for tick in range(1, TICKS + 1):
+        for timer in timers:
+            if tick >= timer.due:
+                timer.fired += 1
+                timer.due = tick + rng.randint(1, MAX_DELAY)
+    elapsed = time.perf_counter() - start
+    return elapsed, sum(timer.fired for timer in timers)
+
+def scheduled(count, rng):
+    scheduler = Scheduler()
+    fired = [0]
+
+    def fire():
+        fired[0] += 1
+        scheduler.after(rng.randint(1, MAX_DELAY), fire)
+
+    for _ in range(count):
+        scheduler.at(rng.randint(1, MAX_DELAY), fire)
+    start = time.perf_counter()
+    for tick in range(1, TICKS + 1):
+        scheduler.run_due(tick)
+    elapsed = time.perf_counter() - start
+    return elapsed, fired[0]
+
+def main():
+    print(f"ms per tick over {TICKS} ticks")
+    print(f"{'timers':>8} {'poll':>10} {'heap':>10} {'speedup':>8}")
+    for count in TIMER_COUNTS:
+        before, fired_before = poll(count, random.Random(0))
+        after, fired_after = scheduled(count, random.Random(0))
+        b = before * 1000 / TICKS
+        a = after * 1000 / TICKS
+        print(f"{count:>8} {b:>10.4f} {a:>10.4f} {b / a:>7.1f}x  ({fired_after} events)")
+        # Same workload either way
+        assert abs(fired_before - fired_after) <= count
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+import time
+
+from benchmarks.scenarios import SCENARIOS
+from snapshot import snapshot, restore, fork
+
+# Snapshot size and snapshot/restore time for the end state of each
+# scripted scenario, plus a check that a restored fork carries on exactly
+# like the original.
+#
+#   python -m benchmarks.snapshot
+
+REPEATS = 200
+CHECK_TICKS = 300
+
+def median_us(fn):
+    times = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    times.sort()
+    return times[REPEATS // 2] * 1e6
+
+def main():
+    print(f"{'scenario':>10} {'bytes':>8} {'snapshot':>10} {'restore':>10}")
+    for name, scenario_class in SCENARIOS.items():
+        scenario = scenario_class()
+        world = scenario.make_world()
+        for tick in range(scenario.ticks):
+            world.tick(scenario.before_tick(world, tick))
+
+        data = snapshot(world)
+        copy = fork(world)
+        save_us = median_us(lambda: snapshot(world))
+        restore_us = median_us(lambda: restore(copy, data))
+        print(f"{name:>10} {len(data):>8} {save_us:>8.1f}us {restore_us:>8.1f}us")
+
+        # Both must play out identically from here
+        for tick in range(scenario.ticks, scenario.ticks + CHECK_TICKS):
+            world.tick(scenario.before_tick(world, tick))
+            copy.tick(scenario.before_tick(copy, tick))
+        assert snapshot(copy) == snapshot(world), f"{name}: fork diverged"
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+import argparse
+import gc
+import sys
+import time
+
+from benchmarks.scenarios import SEED, make_invincible, weave
+from world import GameWorld
+
+# Long headless run checking that entity pooling keeps allocations flat:
+# after a warm-up the pools must stop creating objects, the enemy arrays
+# must stop growing and the interpreter's allocated block count must stop
+# growing. Exits non-zero if either does.
+#
+#   python -m benchmarks.soak                 # 100k ticks
+#   python -m benchmarks.soak --ticks 20000
+
+WARMUP_TICKS = 10000
+SAMPLES = 10
+BLOCK_SLACK = 2000  # Allowed drift in allocated blocks (caches, interned values)
+
+def pool_counts(world):
+    return {
+        "enemies": world.enemies.capacity,
+        "power_ups": world.power_up_pool.created,
+        "explosions": world.explosion_pool.created,
+    }
+
+def soak(ticks, warmup=WARMUP_TICKS, samples=SAMPLES, log=None):
+    # Plays warmup ticks, then ticks more; returns (world, failures).
+    # log(tick, blocks, collections, counts) is called samples times.
+    world = GameWorld(SEED)
+    make_invincible(world)
+    for tick in range(warmup):
+        world.tick(weave(tick))
+
+    gc.collect()
+    base_pools = pool_counts(world)
+    base_blocks = sys.getallocatedblocks()
+    base_collections = gc.get_stats()[0]["collections"]
+    interval = max(1, ticks // samples)
+
+    for tick in range(ticks):
+        world.tick(weave(tick))
+        if log and (tick + 1) % interval == 0:
+            log(tick + 1, sys.getallocatedblocks() - base_blocks,
+                gc.get_stats()[0]["collections"] - base_collections, pool_counts(world))
+
+    gc.collect()
+    failures = []
+    grown = {name: count - base_pools[name] for name, count in pool_counts(world).items()
+             if count > base_pools[name]}
+    if grown:
+        failures.append(f"pools kept allocating after warm-up: {grown}")
+    drift = sys.getallocatedblocks() - base_blocks
+    if drift > BLOCK_SLACK:
+        failures.append(f"allocated blocks grew by {drift}")
+    return world, failures
+
+def main():
+    parser = argparse.ArgumentParser(description="Soak the simulation and check allocations stay flat")
+    parser.add_argument("--ticks", type=int, default=100000)
+    args = parser.parse_args()
+
+    def log(tick, blocks, collections, counts):
+        print(f"{tick:>8} {blocks:>+8} {collections:>8}  "
+              f"{counts['enemies']}/{counts['power_ups']}/{counts['explosions']}")
+
+    print(f"{'tick':>8} {'blocks':>8} {'gen0 gc':>8}  objects (enemy slots/power-ups/explosions)")
+    start = time.perf_counter()
+    world, failures = soak(args.ticks, log=log)
+    elapsed = time.perf_counter() - start
+    print(f"{(WARMUP_TICKS + args.ticks) / elapsed:.0f} ticks/s, score {world.score}, level {world.level}")
+    if failures:
+        sys.exit("FAIL: " + "; ".join(failures))
+    print("ok: allocations flat")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+# Cold and warm start of the real game: runs game.py for one frame in a
+# subprocess with its startup report on, and prints the median of each
+# phase. Cold runs start in an empty directory, so the sprite atlas and the
+# sound WAVs are built from scratch; warm runs reuse those caches. "process"
+# is spawn to exit, including interpreter startup and shutdown.
+#
+#   python -m benchmarks.startup
+#
+# Runs headless unless SDL_VIDEODRIVER / SDL_AUDIODRIVER are set.
+
+RUNS = 7
+GAME = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "game.py")
+
+def run_game(cwd):
+    env = dict(os.environ)
+    env.setdefault("SDL_VIDEODRIVER", "dummy")
+    env.setdefault("SDL_AUDIODRIVER", "dummy")
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, GAME, "--startup-report", "--frames", "1"],
+                            cwd=cwd, env=env, capture_output=True, text=True, check=True)
+    elapsed = time.perf_counter() - start
+
+    phases = {}
+    for line in result.stdout.splitlines():
+        if line.startswith("  "):
+            name, ms = line.strip().rsplit(None, 1)
+            phases[name] = float(ms)
+    phases["process"] = elapsed * 1000
+    return phases
+
+def measure(cold):
+    runs = []
+    workdir = tempfile.mkdtemp()
+    try:
+        run_game(workdir)  # Warm the OS file cache (and the asset caches)
+        for _ in range(RUNS):
+            if cold:
+                shutil.rmtree(workdir)
+                workdir = tempfile.mkdtemp()
+            runs.append(run_game(workdir))
+    finally:
+        shutil.rmtree(workdir)
+    return {name: sorted(run[name] for run in runs)[RUNS // 2] for name in runs[0]}
+
+def main():
+    cold = measure(True)
+    warm = measure(False)
+    print(f"median ms over {RUNS} runs")
+    print(f"{'phase':>18} {'cold':>8} {'warm':>8}")
+    for name in cold:
+        print(f"{name:>18} {cold[name]:>8.1f} {warm.get(name, 0.0):>8.1f}")
+
+if __name__ == "__main__":
+    main()
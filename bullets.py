@@ -0,0 +1,161 @@
+import numpy as np
+
+# Structure-of-arrays bullet store. Live bullets occupy slots [0, count);
+# removal is deferred (kill marks a slot dead) and compact() swap-removes
+# the holes, so updates are a handful of vectorized NumPy ops regardless of
+# how many bullets are on screen.
+
+OWNER_PLAYER = 0
+OWNER_BOSS = 1
+
+class Bullet:
+    # Lightweight view onto one pool slot. Only valid until the next
+    # compact(), which moves bullets between slots.
+    __slots__ = ("pool", "index")
+
+    def __init__(self, pool, index):
+        self.pool = pool
+        self.index = index
+
+    @property
+    def x(self):
+        return float(self.pool.x[self.index])
+
+    @x.setter
+    def x(self, value):
+        self.pool.x[self.index] = value
+
+    @property
+    def y(self):
+        return float(self.pool.y[self.index])
+
+    @y.setter
+    def y(self, value):
+        self.pool.y[self.index] = value
+
+    @property
+    def dx(self):
+        return float(self.pool.dx[self.index])
+
+    @property
+    def dy(self):
+        return float(self.pool.dy[self.index])
+
+    @property
+    def speed(self):
+        return float(self.pool.speed[self.index])
+
+    @speed.setter
+    def speed(self, value):
+        self.pool.speed[self.index] = value
+
+    @property
+    def size(self):
+        return float(self.pool.size[self.index])
+
+    @property
+    def owner(self):
+        return int(self.pool.owner[self.index])
+
+    @property
+    def alive(self):
+        return bool(self.pool.alive[self.index])
+
+class BulletPool:
+    def __init__(self, capacity=16384):
+        self.capacity = capacity
+        self.count = 0
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.dx = np.zeros(capacity)
+        self.dy = np.zeros(capacity)
+        self.speed = np.zeros(capacity)
+        self.size = np.zeros(capacity)
+        self.owner = np.zeros(capacity, dtype=np.int8)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.id = np.zeros(capacity, dtype=np.int64)  # Follows a bullet across compaction
+        self.next_id = 0
+        self.columns = (self.x, self.y, self.dx, self.dy, self.speed, self.size, self.owner, self.id)
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        for index in range(self.count):
+            yield Bullet(self, index)
+
+    def clear(self):
+        self.alive[:self.count] = False
+        self.count = 0
+
+    def spawn(self, x, y, dx, dy, speed=12, size=5, owner=OWNER_PLAYER):
+        # Returns the new slot, or -1 when the pool is full (shot dropped)
+        index = self.count
+        if index >= self.capacity:
+            return -1
+        self.x[index] = x
+        self.y[index] = y
+        self.dx[index] = dx
+        self.dy[index] = dy
+        self.speed[index] = speed
+        self.size[index] = size
+        self.owner[index] = owner
+        self.alive[index] = True
+        self.id[index] = self.next_id
+        self.next_id += 1
+        self.count = index + 1
+        return index
+
+    def spawn_many(self, x, y, dx, dy, speed=12, size=5, owner=OWNER_PLAYER):
+        # Batched spawn from arrays (or scalars broadcast against dx).
+        # Returns the slice of slots written; overflow is dropped.
+        dx = np.asarray(dx, dtype=float)
+        start = self.count
+        n = min(len(dx), self.capacity - start)
+        end = start + n
+        self.x[start:end] = np.broadcast_to(x, dx.shape)[:n]
+        self.y[start:end] = np.broadcast_to(y, dx.shape)[:n]
+        self.dx[start:end] = dx[:n]
+        self.dy[start:end] = np.broadcast_to(dy, dx.shape)[:n]
+        self.speed[start:end] = speed
+        self.size[start:end] = size
+        self.owner[start:end] = owner
+        self.alive[start:end] = True
+        self.id[start:end] = np.arange(self.next_id, self.next_id + n)
+        self.next_id += n
+        self.count = end
+        return slice(start, end)
+
+    def move(self):
+        n = self.count
+        speed = self.speed[:n]
+        self.x[:n] += self.dx[:n] * speed
+        self.y[:n] += self.dy[:n] * speed
+
+    def cull(self, width, height, margin=10):
+        # Kill everything outside the play area plus margin, then compact
+        n = self.count
+        x = self.x[:n]
+        y = self.y[:n]
+        off = (y < -margin) | (y > height + margin) | (x < -margin) | (x > width + margin)
+        self.alive[:n] &= ~off
+        self.compact()
+
+    def kill(self, index):
+        self.alive[index] = False
+
+    def compact(self):
+        # Swap-remove: fill dead slots below the new count with the live
+        # bullets above it. Only those bullets move; order is not kept.
+        n = self.count
+        alive = self.alive[:n]
+        live = int(np.count_nonzero(alive))
+        if live == n:
+            return
+        holes = np.flatnonzero(~alive[:live])
+        movers = live + np.flatnonzero(alive[live:])
+        for column in self.columns:
+            column[holes] = column[movers]
+        self.alive[holes] = True
+        self.alive[live:n] = False
+        self.count = live
@@ -0,0 +1,20 @@
+import pygame
+
+from world import INPUT_LEFT, INPUT_RIGHT, INPUT_UP, INPUT_DOWN, INPUT_FIRE
+
+# Keyboard to input bitmask, shared by the local game and network play
+
+def read_inputs():
+    keys = pygame.key.get_pressed()
+    inputs = 0
+    if keys[pygame.K_LEFT] or keys[pygame.K_a]:
+        inputs |= INPUT_LEFT
+    if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
+        inputs |= INPUT_RIGHT
+    if keys[pygame.K_UP] or keys[pygame.K_w]:
+        inputs |= INPUT_UP
+    if keys[pygame.K_DOWN] or keys[pygame.K_s]:
+        inputs |= INPUT_DOWN
+    if keys[pygame.K_SPACE]:
+        inputs |= INPUT_FIRE
+    return inputs
@@ -0,0 +1,196 @@
+import numpy as np
+
+# Structure-of-arrays enemy store. Live enemies occupy slots [0, count) in
+# spawn order, and movement is a few type-grouped NumPy kernels per tick
+# instead of a Python method call per enemy, so thousands of enemies cost
+# about as much to move as a handful. remove() compacts in place keeping
+# that order, which keeps collision order (and so replays) deterministic.
+
+ENEMY_SIZE = 40
+
+# Movement types
+STRAIGHT = 0  # Moves straight down
+ZIGZAG = 1    # Reverses horizontal direction every 30 ticks
+HOMING = 2    # Slower, steers towards the player
+
+ZIGZAG_TICKS = 30
+HOMING_ACCEL = 0.1
+HOMING_MAX_SPEED = 2
+
+class Enemy:
+    # Lightweight view onto one slot. Only valid until the next remove(),
+    # which moves enemies between slots.
+    __slots__ = ("pool", "index")
+
+    width = ENEMY_SIZE
+    height = ENEMY_SIZE
+
+    def __init__(self, pool, index):
+        self.pool = pool
+        self.index = index
+
+    @property
+    def type(self):
+        return int(self.pool.type[self.index])
+
+    @property
+    def x(self):
+        return float(self.pool.x[self.index])
+
+    @x.setter
+    def x(self, value):
+        self.pool.x[self.index] = value
+
+    @property
+    def y(self):
+        return float(self.pool.y[self.index])
+
+    @y.setter
+    def y(self, value):
+        self.pool.y[self.index] = value
+
+    @property
+    def prev_x(self):
+        return float(self.pool.prev_x[self.index])
+
+    @property
+    def prev_y(self):
+        return float(self.pool.prev_y[self.index])
+
+    @property
+    def dx(self):
+        return float(self.pool.dx[self.index])
+
+    @property
+    def dy(self):
+        return float(self.pool.dy[self.index])
+
+    @property
+    def health(self):
+        return int(self.pool.health[self.index])
+
+    @health.setter
+    def health(self, value):
+        self.pool.health[self.index] = value
+
+    def hit(self, damage):
+        return self.pool.hit(self.index, damage)
+
+class EnemyArray:
+    def __init__(self, capacity=64):
+        self.count = 0
+        self.next_id = 0  # Ids are never reused, so they follow an enemy across ticks
+        self.allocate(capacity)
+
+    def allocate(self, capacity):
+        # (Re)size every column, keeping live slots
+        def resize(old, dtype):
+            new = np.zeros(capacity, dtype=dtype)
+            if old is not None:
+                new[:self.count] = old[:self.count]
+            return new
+
+        old = getattr(self, "columns", (None,) * 10)
+        self.capacity = capacity
+        self.x = resize(old[0], float)
+        self.y = resize(old[1], float)
+        self.prev_x = resize(old[2], float)
+        self.prev_y = resize(old[3], float)
+        self.dx = resize(old[4], float)
+        self.dy = resize(old[5], float)
+        self.health = resize(old[6], np.int64)
+        self.type = resize(old[7], np.int8)
+        self.zigzag_counter = resize(old[8], np.int32)
+        self.id = resize(old[9], np.int64)
+        self.columns = (self.x, self.y, self.prev_x, self.prev_y, self.dx, self.dy,
+                        self.health, self.type, self.zigzag_counter, self.id)
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        for index in range(self.count):
+            yield Enemy(self, index)
+
+    def __getitem__(self, index):
+        return Enemy(self, index)
+
+    def clear(self):
+        self.count = 0
+
+    def spawn(self, type_, rng, width):
+        # Draws from rng in the same order as the original per-object
+        # constructor, so seeded runs are unchanged. Returns the new slot.
+        index = self.count
+        if index >= self.capacity:
+            self.allocate(self.capacity * 2)
+        x = rng.randint(ENEMY_SIZE, width - ENEMY_SIZE)
+        if type_ == STRAIGHT:
+            dx = 0
+            dy = 2 + rng.random()
+        elif type_ == ZIGZAG:
+            dx = rng.choice((-1, 1)) * (1 + rng.random())
+            dy = 1.5 + rng.random()
+        else:
+            dx = 0
+            dy = 1 + rng.random()
+        self.x[index] = self.prev_x[index] = x
+        self.y[index] = self.prev_y[index] = -ENEMY_SIZE
+        self.dx[index] = dx
+        self.dy[index] = dy
+        self.health[index] = 10 + 10 * type_
+        self.type[index] = type_
+        self.zigzag_counter[index] = 0
+        self.id[index] = self.next_id
+        self.next_id += 1
+        self.count = index + 1
+        return index
+
+    def move(self, player_x, width):
+        n = self.count
+        if not n:
+            return
+        x = self.x[:n]
+        y = self.y[:n]
+        dx = self.dx[:n]
+        kind = self.type[:n]
+        self.prev_x[:n] = x
+        self.prev_y[:n] = y
+
+        # Zigzag: flip direction when the counter runs out
+        zigzag = kind == ZIGZAG
+        if zigzag.any():
+            counter = self.zigzag_counter[:n]
+            np.add(counter, 1, out=counter, where=zigzag)
+            flip = zigzag & (counter > ZIGZAG_TICKS)
+            np.negative(dx, out=dx, where=flip)
+            counter[flip] = 0
+
+        # Homing: accelerate towards the player, clamped at the max speed
+        homing = kind == HOMING
+        if homing.any():
+            steer = np.where(player_x > x, HOMING_ACCEL, -HOMING_ACCEL)
+            np.copyto(dx, np.clip(dx + steer, -HOMING_MAX_SPEED, HOMING_MAX_SPEED), where=homing)
+
+        # Bounce off the side walls
+        np.negative(dx, out=dx, where=(x < ENEMY_SIZE) | (x > width - ENEMY_SIZE))
+
+        x += dx
+        y += self.dy[:n]
+
+    def off_screen(self, height):
+        return self.y[:self.count] > height + 50
+
+    def hit(self, index, damage):
+        self.health[index] -= damage
+        return self.health[index] <= 0
+
+    def remove(self, keep):
+        # Keep only the slots where keep is True, preserving their order
+        survivors = np.flatnonzero(keep)
+        k = len(survivors)
+        if k == self.count:
+            return
+        for column in self.columns:
+            column[:k] = column[survivors]
+        self.count = k
@@ -0,0 +1,51 @@
+import threading
+
+from timing import clock
+
+# Startup work that runs on a background thread while game.py shows a
+# loading screen: building the renderer and its sprite atlas, opening the
+# mixer, synthesizing sounds, fast-forwarding a replay. Jobs run in the order they
+# were added; the main thread polls done() between loading-screen frames and
+# collects the results afterwards.
+
+class Loader:
+    def __init__(self):
+        self.jobs = []
+        self.results = {}
+        self.timings = []  # (job, seconds) as each one finishes
+        self.finished = 0
+        self.error = None
+        self.thread = None
+
+    def add(self, name, function, *args):
+        self.jobs.append((name, function, args))
+
+    def start(self):
+        self.thread = threading.Thread(target=self.run, name="loader", daemon=True)
+        self.thread.start()
+
+    def run(self):
+        try:
+            for name, function, args in self.jobs:
+                start = clock()
+                self.results[name] = function(*args)
+                self.timings.append((name, clock() - start))
+                self.finished += 1
+        except BaseException as e:
+            self.error = e
+
+    def done(self, timeout=0):
+        # Whether all jobs have finished, waiting up to timeout seconds
+        if timeout:
+            self.thread.join(timeout)
+        return not self.thread.is_alive()
+
+    def progress(self):
+        return self.finished / len(self.jobs) if self.jobs else 1.0
+
+    def wait(self):
+        # Results by job name; re-raises whatever stopped the jobs
+        self.thread.join()
+        if self.error is not None:
+            raise self.error
+        return self.results
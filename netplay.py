@@ -0,0 +1,775 @@
+import argparse
+import bisect
+import heapq
+import json
+import random
+import socket
+import struct
+import sys
+import time
+import zlib
+
+import numpy as np
+
+from timing import PhaseTimer, clock, percentile
+from world import GameWorld, Boss, POWERUP_TYPES, TICK_MS, TICK_RATE
+
+# Networked co-op over UDP. The host runs the only simulation; clients send
+# their input bitmask and get back a stream of per-tick world states, which
+# they draw INTERP_TICKS behind the newest one, blending between the two
+# states around the render time.
+#
+# States are delta compressed against the newest state the client has
+# acknowledged (it echoes the tick in every input packet). Entities are
+# matched by id between the two states, positions are predicted forward
+# along their velocity, and only the residuals (mostly zero), the ids that
+# appeared and a bitmask of the ones that went away are sent, then zlib'd.
+# Values are fixed point (1/SCALE pixel) integers, so host and client
+# rebuild bit-identical states from the same baseline. A lost packet only
+# means the next one is diffed against an older acknowledged state (or sent
+# whole once that has left the host's HISTORY).
+#
+#   python netplay.py host [--port 5555]               # player 1, waits for player 2
+#   python netplay.py join 192.168.1.20[:5555]          # player 2
+#   python netplay.py loopback --loss 0.1 --latency 80  # headless bots, prints metrics
+#
+# --loss, --latency and --jitter feed every outgoing packet through a
+# packet-loss/latency simulator (Link) on that end.
+
+DEFAULT_PORT = 5555
+MAGIC = b"SANP"
+PROTOCOL = 2  # 2: inputs name the game of the state they acknowledge
+HELLO, WELCOME, INPUT, STATE = range(4)
+
+PACKET = struct.Struct("<4sBB")       # magic, protocol, packet type
+WELCOME_BODY = struct.Struct("<BB")   # player index, number of players
+INPUT_BODY = struct.Struct("<IIBB")   # input sequence, acknowledged state tick and its game, bitmask
+STATE_HEAD = struct.Struct("<BII")    # game, tick, baseline tick (0: none)
+GLOBALS = struct.Struct("<qiB")       # score, level, flags
+UDP_OVERHEAD = 28                     # IPv4 + UDP header bytes per datagram
+MAX_DATAGRAM = 65507
+
+SCALE = 8           # Fixed-point steps per pixel
+HISTORY = 64        # Sent states the host keeps as baselines
+INTERP_TICKS = 3    # How far behind the newest state clients draw
+HELLO_INTERVAL = 0.25
+TIMEOUT = 5.0       # Seconds of silence before a peer is dropped
+
+GAME_OVER = 1
+BOSS_KILLED = 2
+BOSS_FIGHT = 4
+EVENT_NAMES = ("shoot", "explosion", "powerup")
+
+# State tables in packet order: name, columns, (position, velocity) column
+# pairs predicted forward between states
+TABLES = (
+    ("players", ("x", "y", "health", "lives", "shield", "flags"), ()),
+    ("enemies", ("x", "y", "vx", "vy", "type", "health"), ((0, 2), (1, 3))),
+    ("bullets", ("x", "y", "vx", "vy", "size"), ((0, 2), (1, 3))),
+    ("enemy_bullets", ("x", "y", "vx", "vy", "size"), ((0, 2), (1, 3))),
+    ("boss", ("x", "y", "health", "max_health"), ()),
+    ("power_ups", ("x", "y", "type"), ()),
+    ("explosions", ("x", "y", "frame", "size"), ()),
+)
+RAPID_FIRE = 1
+MULTI_SHOT = 2
+INVINCIBLE = 4
+
+class NetError(Exception):
+    pass
+
+def fixed(values):
+    return np.rint(np.asarray(values, dtype=float) * SCALE).astype(np.int32)
+
+def clamp(values):
+    # Counts such as health into int32 (benchmark bosses are near immortal)
+    return np.minimum(np.asarray(values, dtype=np.int64), 2**31 - 1)
+
+def table(ids, *columns):
+    # (ids, rows) sorted by id, rows as an int32 matrix
+    ids = np.asarray(ids, dtype=np.int64)
+    rows = np.column_stack(columns).astype(np.int32) if len(ids) else np.zeros((0, len(columns)), np.int32)
+    order = np.argsort(ids, kind="stable")
+    return ids[order], rows[order]
+
+def bullet_table(bullets):
+    n = bullets.count
+    speed = bullets.speed[:n]
+    return table(bullets.id[:n], fixed(bullets.x[:n]), fixed(bullets.y[:n]),
+                 fixed(bullets.dx[:n] * speed), fixed(bullets.dy[:n] * speed), fixed(bullets.size[:n]))
+
+def capture(world):
+    # The state clients see, in wire form: globals plus one table per TABLES
+    players = world.players
+    flags = [(RAPID_FIRE if p.rapid_fire else 0) | (MULTI_SHOT if p.multi_shot else 0) |
+             (INVINCIBLE if p.invincible else 0) for p in players]
+    enemies = world.enemies
+    n = enemies.count
+    boss = world.boss
+    power_ups = world.power_ups
+    explosions = world.explosions
+    tables = (
+        table(range(len(players)), fixed([p.x for p in players]), fixed([p.y for p in players]),
+              [p.health for p in players], [p.lives for p in players], [p.shield for p in players], flags),
+        table(enemies.id[:n], fixed(enemies.x[:n]), fixed(enemies.y[:n]),
+              fixed(enemies.x[:n] - enemies.prev_x[:n]), fixed(enemies.y[:n] - enemies.prev_y[:n]),
+              enemies.type[:n], clamp(enemies.health[:n])),
+        bullet_table(world.bullets),
+        bullet_table(world.enemy_bullets),
+        table([0], fixed([boss.x]), fixed([boss.y]), clamp([boss.health]), clamp([boss.max_health]))
+        if boss else table([], [], [], [], []),
+        table(range(len(power_ups)), fixed([p.x for p in power_ups]), fixed([p.y for p in power_ups]),
+              [POWERUP_TYPES.index(p.type) for p in power_ups]),
+        table(range(len(explosions)), fixed([e.x for e in explosions]), fixed([e.y for e in explosions]),
+              fixed([e.frame for e in explosions]), fixed([e.size for e in explosions])),
+    )
+    flags = ((GAME_OVER if world.game_over else 0) | (BOSS_KILLED if world.boss_killed else 0) |
+             (BOSS_FIGHT if world.boss_fight else 0))
+    return (world.score, world.level, flags), tables
+
+def predicted(rows, predict, dt):
+    rows = rows.copy()
+    for position, velocity in predict:
+        rows[:, position] += rows[:, velocity] * dt
+    return rows
+
+def encode_table(out, base, current, predict, dt):
+    base_ids, base_rows = base
+    ids, rows = current
+    nb = len(base_ids)
+    if nb:
+        slots = np.minimum(np.searchsorted(base_ids, ids), nb - 1)
+        matched = base_ids[slots] == ids
+    else:
+        slots = np.zeros(len(ids), dtype=np.intp)
+        matched = np.zeros(len(ids), dtype=bool)
+    keep = np.zeros(nb, dtype=bool)
+    keep[slots[matched]] = True
+    residual = rows[matched] - predicted(base_rows[keep], predict, dt)
+    added = ~matched
+    out.append(struct.pack("<II", nb, int(np.count_nonzero(added))))
+    out.append(np.packbits(keep).tobytes())
+    out.append(ids[added].tobytes())
+    out.append(rows[added].tobytes())
+    out.append(residual.tobytes())
+
+def decode_table(data, pos, base, width, predict, dt):
+    base_ids, base_rows = base
+    nb, na = struct.unpack_from("<II", data, pos)
+    pos += 8
+    if nb != len(base_ids):
+        raise NetError("baseline mismatch")
+    mask_bytes = (nb + 7) // 8
+    keep = np.unpackbits(np.frombuffer(data, np.uint8, mask_bytes, pos))[:nb].astype(bool)
+    pos += mask_bytes
+    added_ids = np.frombuffer(data, np.int64, na, pos)
+    pos += na * 8
+    added_rows = np.frombuffer(data, np.int32, na * width, pos).reshape(na, width)
+    pos += na * width * 4
+    nk = int(np.count_nonzero(keep))
+    residual = np.frombuffer(data, np.int32, nk * width, pos).reshape(nk, width)
+    pos += nk * width * 4
+    ids = np.concatenate((base_ids[keep], added_ids))
+    rows = np.concatenate((predicted(base_rows[keep], predict, dt) + residual, added_rows))
+    order = np.argsort(ids, kind="stable")
+    return pos, (ids[order], rows[order])
+
+EMPTY_STATE = ((0, 0, 0), tuple((np.zeros(0, np.int64), np.zeros((0, len(columns)), np.int32))
+                                for _, columns, _ in TABLES))
+
+def encode_state(game, tick, state, events, base_tick=0, base=EMPTY_STATE):
+    # Returns (payload, uncompressed body size)
+    out = [GLOBALS.pack(*state[0]), bytes([len(events)]), bytes(EVENT_NAMES.index(e) for e in events)]
+    dt = tick - base_tick
+    for (_, _, predict), base_table, current in zip(TABLES, base[1], state[1]):
+        encode_table(out, base_table, current, predict, dt)
+    body = b"".join(out)
+    return STATE_HEAD.pack(game, tick, base_tick) + zlib.compress(body, 1), len(body)
+
+def decode_state(payload, pos, baselines):
+    # Returns (game, tick, state, events); baselines maps tick -> state
+    game, tick, base_tick = STATE_HEAD.unpack_from(payload, pos)
+    if base_tick:
+        base = baselines.get(base_tick)
+        if base is None:
+            raise NetError(f"missing baseline {base_tick}")
+    else:
+        base = EMPTY_STATE
+    try:
+        data = zlib.decompress(payload[pos + STATE_HEAD.size:])
+        score, level, flags = GLOBALS.unpack_from(data, 0)
+        pos = GLOBALS.size
+        count = data[pos]
+        events = [EVENT_NAMES[i] for i in data[pos + 1:pos + 1 + count]]
+        pos += 1 + count
+        dt = tick - base_tick
+        tables = []
+        for (_, columns, predict), base_table in zip(TABLES, base[1]):
+            pos, decoded = decode_table(data, pos, base_table, len(columns), predict, dt)
+            tables.append(decoded)
+    except (zlib.error, struct.error, ValueError, IndexError) as e:
+        raise NetError(f"bad state packet: {e}") from None
+    return game, tick, ((score, level, flags), tuple(tables)), events
+
+def newer_game(game, current):
+    # Game ids count up mod 256; an id up to half the range ahead is newer
+    return 0 < (game - current) % 256 < 128
+
+def same_state(a, b):
+    return a[0] == b[0] and all(np.array_equal(x[0], y[0]) and np.array_equal(x[1], y[1])
+                                for x, y in zip(a[1], b[1]))
+
+class Link:
+    # Packet-loss/latency simulator on one end's outgoing packets: drops a
+    # loss fraction at random and holds the rest for latency +- jitter ms
+    # (so they can also arrive out of order). Call flush() regularly.
+    def __init__(self, loss=0.0, latency=0.0, jitter=0.0, seed=0, clock=time.monotonic):
+        self.loss = loss
+        self.latency = latency / 1000
+        self.jitter = jitter / 1000
+        self.rng = random.Random(seed)
+        self.clock = clock
+        self.queue = []
+        self.seq = 0
+        self.dropped = 0
+        self.sent = 0
+
+    def send(self, sock, data, address):
+        self.sent += 1
+        if self.loss and self.rng.random() < self.loss:
+            self.dropped += 1
+            return
+        if not self.latency and not self.jitter:
+            sock.sendto(data, address)
+            return
+        delay = max(0.0, self.latency + self.rng.uniform(-self.jitter, self.jitter))
+        heapq.heappush(self.queue, (self.clock() + delay, self.seq, sock, data, address))
+        self.seq += 1
+
+    def flush(self):
+        now = self.clock()
+        queue = self.queue
+        while queue and queue[0][0] <= now:
+            _, _, sock, data, address = heapq.heappop(queue)
+            sock.sendto(data, address)
+
+def make_socket(address):
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.setblocking(False)
+    sock.bind(address)
+    return sock
+
+def receive(sock):
+    # Every datagram waiting on the socket
+    while True:
+        try:
+            yield sock.recvfrom(MAX_DATAGRAM)
+        except (BlockingIOError, InterruptedError):
+            return
+        except ConnectionResetError:
+            continue  # ICMP port unreachable from a peer that went away
+
+def packet(kind, body=b""):
+    return PACKET.pack(MAGIC, PROTOCOL, kind) + body
+
+def parse(data):
+    if len(data) < PACKET.size:
+        return None
+    magic, protocol, kind = PACKET.unpack_from(data)
+    if magic != MAGIC or protocol != PROTOCOL:
+        return None
+    return kind
+
+class Peer:
+    def __init__(self, address, index, now):
+        self.address = address
+        self.index = index
+        self.inputs = 0
+        self.input_seq = 0
+        self.acked = 0
+        self.heard = now
+
+class Host:
+    def __init__(self, world, port=DEFAULT_PORT, bind="0.0.0.0", link=None, clock=time.monotonic):
+        self.world = world
+        self.game = 0
+        self.sock = make_socket((bind, port))
+        self.port = self.sock.getsockname()[1]
+        self.link = link or Link(clock=clock)
+        self.clock = clock
+        self.peers = {}  # address -> Peer
+        self.history = {}  # tick -> state sent
+        self.timer = PhaseTimer()  # Per tick: "sim", "capture", "encode"
+        self.bytes_per_tick = []  # Wire bytes sent per tick, all peers
+        self.raw_bytes = 0
+        self.payload_bytes = 0
+        self.full_states = 0
+        self.delta_states = 0
+        self.oversize = 0
+
+    def restart(self, world):
+        # New game on the same connection; clients drop their old states
+        self.world = world
+        self.game = (self.game + 1) % 256
+        self.history = {}
+        for peer in self.peers.values():
+            peer.acked = 0
+
+    def poll(self):
+        now = self.clock()
+        for data, address in receive(self.sock):
+            kind = parse(data)
+            peer = self.peers.get(address)
+            if kind == HELLO:
+                if peer is None:
+                    taken = {p.index for p in self.peers.values()}
+                    free = [i for i in range(1, len(self.world.players)) if i not in taken]
+                    if not free:
+                        continue  # Game full
+                    peer = self.peers[address] = Peer(address, free[0], now)
+                peer.heard = now
+                self.link.send(self.sock, packet(WELCOME, WELCOME_BODY.pack(peer.index, len(self.world.players))), address)
+            elif kind == INPUT and peer is not None and len(data) >= PACKET.size + INPUT_BODY.size:
+                seq, acked, game, inputs = INPUT_BODY.unpack_from(data, PACKET.size)
+                peer.heard = now
+                if seq > peer.input_seq:  # Ignore stale, reordered inputs
+                    peer.input_seq = seq
+                    peer.inputs = inputs
+                    if game == self.game:  # A tick of a previous game is no baseline
+                        peer.acked = max(peer.acked, acked)
+        for address, peer in list(self.peers.items()):
+            if now - peer.heard > TIMEOUT:
+                del self.peers[address]
+
+    def tick(self, inputs):
+        # One simulation tick with the local player's inputs, then a state
+        # to every peer
+        self.poll()
+        world = self.world
+        all_inputs = [0] * len(world.players)
+        all_inputs[0] = inputs
+        for peer in self.peers.values():
+            all_inputs[peer.index] = peer.inputs
+
+        start = clock()
+        world.tick(all_inputs)
+        captured = clock()
+        self.timer.add("sim", captured - start)
+        state = capture(world)
+        tick = world.ticks
+        self.history[tick] = state
+        self.history.pop(tick - HISTORY, None)
+        encoded = clock()
+        self.timer.add("capture", encoded - captured)
+
+        sent = 0
+        for peer in self.peers.values():
+            base = self.history.get(peer.acked) if peer.acked else None
+            if base is None:
+                payload, raw = encode_state(self.game, tick, state, world.events)
+                self.full_states += 1
+            else:
+                payload, raw = encode_state(self.game, tick, state, world.events, peer.acked, base)
+                self.delta_states += 1
+            data = packet(STATE, payload)
+            if len(data) > MAX_DATAGRAM:
+                self.oversize += 1
+                continue
+            self.link.send(self.sock, data, peer.address)
+            self.raw_bytes += raw
+            self.payload_bytes += len(data)
+            sent += len(data) + UDP_OVERHEAD
+        self.link.flush()
+        self.timer.add("encode", clock() - encoded)
+        self.timer.end_frame()
+        self.bytes_per_tick.append(sent)
+
+    def report(self):
+        sent = sorted(self.bytes_per_tick)
+        ticks = len(sent) or 1
+        return {
+            "ticks": len(sent),
+            "tick_ms": self.timer.summary()["phases_ms"],
+            "bytes_per_tick": {"mean": sum(sent) / ticks, "p95": percentile(sent, 0.95), "max": sent[-1] if sent else 0},
+            "kbit_per_s": sum(sent) * 8 * TICK_RATE / ticks / 1000,
+            "compression": self.raw_bytes / self.payload_bytes if self.payload_bytes else 0.0,
+            "full_states": self.full_states,
+            "delta_states": self.delta_states,
+            "oversize_dropped": self.oversize,
+            "link_dropped": self.link.dropped,
+        }
+
+class Client:
+    def __init__(self, address, link=None, clock=time.monotonic):
+        self.address = address
+        self.sock = make_socket(("0.0.0.0", 0))
+        self.link = link or Link(clock=clock)
+        self.clock = clock
+        self.index = None
+        self.world = None  # Mirror of the host's world for the renderer
+        self.game = None
+        self.states = {}  # tick -> state
+        self.ticks = []  # Sorted ticks in self.states
+        self.latest = 0
+        self.first = None  # First state tick of this game
+        self.render_tick = None
+        self.alpha = 1.0
+        self.input_seq = 0
+        self.last_hello = None
+        self.last_heard = None
+        self.events = []  # Sound cues of new states since the last take_events()
+        self.timer = PhaseTimer()  # Per received state: "decode"
+        self.received_bytes = 0
+        self.received = 0
+        self.stale = 0  # Arrived after a newer state, or from a previous game
+        self.undecodable = 0
+
+    @property
+    def connected(self):
+        return self.index is not None
+
+    def poll(self):
+        now = self.clock()
+        if not self.connected and (self.last_hello is None or now - self.last_hello > HELLO_INTERVAL):
+            self.link.send(self.sock, packet(HELLO), self.address)
+            self.last_hello = now
+        self.link.flush()
+
+        new = []
+        for data, address in receive(self.sock):
+            if address != self.address:
+                continue
+            kind = parse(data)
+            self.last_heard = now
+            if kind == WELCOME and not self.connected:
+                self.index, players = WELCOME_BODY.unpack_from(data, PACKET.size)
+                self.world = GameWorld(0, players=players)
+            elif kind == STATE and self.connected:
+                self.received_bytes += len(data) + UDP_OVERHEAD
+                if len(data) < PACKET.size + STATE_HEAD.size:
+                    self.undecodable += 1
+                    continue
+                game = data[PACKET.size]
+                if self.game is not None and game != self.game:
+                    if not newer_game(game, self.game):
+                        self.stale += 1  # Delayed state from before a restart
+                        continue
+                    self.game = None
+                if self.game is None:
+                    self.game = game
+                    self.states = {}
+                    self.ticks = []
+                    self.latest = 0
+                    self.first = None
+                    self.render_tick = None
+                start = clock()
+                try:
+                    game, tick, state, events = decode_state(data, PACKET.size, self.states)
+                except NetError:
+                    self.undecodable += 1
+                    continue
+                self.timer.add("decode", clock() - start)
+                self.timer.end_frame()
+                if tick in self.states:
+                    continue
+                self.received += 1
+                if tick < self.latest:
+                    self.stale += 1
+                self.states[tick] = state
+                bisect.insort(self.ticks, tick)
+                while len(self.ticks) > HISTORY:
+                    del self.states[self.ticks.pop(0)]
+                self.latest = max(self.latest, tick)
+                if self.first is None or tick < self.first:
+                    self.first = tick
+                self.events.extend(events)
+                new.append(tick)
+        return new
+
+    def send_input(self, inputs):
+        if not self.connected:
+            return
+        self.input_seq += 1
+        body = INPUT_BODY.pack(self.input_seq, self.latest, self.game or 0, inputs)
+        self.link.send(self.sock, packet(INPUT, body), self.address)
+        self.link.flush()
+
+    def take_events(self):
+        events = self.events
+        self.events = []
+        return events
+
+    def update(self, dt):
+        # Advance the render clock by dt ms, steering it to stay
+        # INTERP_TICKS behind the newest state, and pose the mirror world
+        if not self.ticks:
+            return False
+        target = self.latest - INTERP_TICKS
+        if self.render_tick is None or abs(self.render_tick - target) > 2 * TICK_RATE // 10:
+            self.render_tick = float(target)
+        else:
+            self.render_tick += dt / TICK_MS
+            self.render_tick += (target - self.render_tick) * 0.1
+        self.render_tick = min(self.render_tick, self.latest)
+
+        ticks = self.ticks
+        i = bisect.bisect_right(ticks, self.render_tick)
+        after = ticks[min(i, len(ticks) - 1)]
+        before = ticks[max(i - 1, 0)]
+        if after > before:
+            self.alpha = (self.render_tick - before) / (after - before)
+        else:
+            self.alpha = 1.0
+        pose(self.world, self.states[before], self.states[after], after, after - before)
+        return True
+
+    def report(self):
+        expected = self.latest - self.first + 1 if self.first is not None else 0
+        ticks = max(1, self.latest)
+        return {
+            "states_received": self.received,
+            "states_missing": expected - self.received,
+            "stale_states": self.stale,
+            "undecodable": self.undecodable,
+            "bytes_per_tick": self.received_bytes / ticks,
+            "decode_ms": self.timer.summary()["frame_ms"],
+            "interp_ticks": self.latest - self.render_tick if self.render_tick is not None else None,
+            "link_dropped": self.link.dropped,
+        }
+
+def from_fixed(values):
+    return values / SCALE
+
+def match_previous(ids, prev_ids, prev_rows, rows):
+    # Position columns of the earlier state for each id (the later state's
+    # own for ids that appeared since), and which ids were found
+    if not len(prev_ids):
+        return rows[:, :2], np.zeros(len(ids), dtype=bool)
+    slots = np.minimum(np.searchsorted(prev_ids, ids), len(prev_ids) - 1)
+    found = prev_ids[slots] == ids
+    return np.where(found[:, None], prev_rows[slots, :2], rows[:, :2]), found
+
+def pose(world, before, after, tick, gap):
+    # Write a state into a mirror GameWorld so the stock Renderer draws it,
+    # with previous positions from the earlier state: Renderer.draw(world,
+    # alpha) then blends between the two.
+    (score, level, flags), tables = after
+    prev_tables = before[1]
+    world.score = score
+    world.level = level
+    world.game_over = bool(flags & GAME_OVER)
+    world.boss_killed = bool(flags & BOSS_KILLED)
+    world.boss_fight = bool(flags & BOSS_FIGHT)
+    world.ticks = tick
+    (ids, rows), (prev_ids, prev_rows) = tables[0], prev_tables[0]
+    prev = from_fixed(match_previous(ids, prev_ids, prev_rows, rows)[0])
+    for i, player in enumerate(world.players):
+        x, y, health, lives, shield, bits = rows[i].tolist()
+        player.x, player.y = x / SCALE, y / SCALE
+        player.prev_x, player.prev_y = prev[i].tolist()
+        player.health, player.lives, player.shield = health, lives, shield
+        player.rapid_fire = bool(bits & RAPID_FIRE)
+        player.multi_shot = bool(bits & MULTI_SHOT)
+        player.invincible = bool(bits & INVINCIBLE)
+
+    (ids, rows), (prev_ids, prev_rows) = tables[1], prev_tables[1]
+    enemies = world.enemies
+    n = len(ids)
+    if n > enemies.capacity:
+        enemies.allocate(max(n, enemies.capacity * 2))
+    prev = from_fixed(match_previous(ids, prev_ids, prev_rows, rows)[0])
+    enemies.x[:n] = from_fixed(rows[:, 0])
+    enemies.y[:n] = from_fixed(rows[:, 1])
+    enemies.prev_x[:n] = prev[:, 0]
+    enemies.prev_y[:n] = prev[:, 1]
+    enemies.type[:n] = rows[:, 4]
+    enemies.health[:n] = rows[:, 5]
+    enemies.id[:n] = ids
+    enemies.count = n
+
+    for (ids, rows), (prev_ids, prev_rows), bullets in zip(tables[2:4], prev_tables[2:4],
+                                                           (world.bullets, world.enemy_bullets)):
+        # The renderer steps bullets back along dx * speed; make that the
+        # whole move between the two states
+        n = min(len(ids), bullets.capacity)
+        rows = rows[:n]
+        ids = ids[:n]
+        prev, found = match_previous(ids, prev_ids, prev_rows, rows)
+        moved = np.where(found[:, None], rows[:, :2] - prev, rows[:, 2:4] * gap)
+        bullets.x[:n] = from_fixed(rows[:, 0])
+        bullets.y[:n] = from_fixed(rows[:, 1])
+        bullets.dx[:n] = from_fixed(moved[:, 0])
+        bullets.dy[:n] = from_fixed(moved[:, 1])
+        bullets.speed[:n] = 1
+        bullets.size[:n] = from_fixed(rows[:, 4])
+        bullets.alive[:n] = True
+        bullets.count = n
+
+    (ids, rows), (prev_ids, prev_rows) = tables[4], prev_tables[4]
+    if len(ids):
+        x, y, health, max_health = rows[0].tolist()
+        boss = world.boss or Boss(level)
+        boss.prev_x, boss.prev_y = (from_fixed(prev_rows[0, :2]).tolist() if len(prev_ids)
+                                    else (x / SCALE, y / SCALE))
+        boss.x, boss.y = x / SCALE, y / SCALE
+        boss.health, boss.max_health = health, max_health
+        world.boss = boss
+    else:
+        world.boss = None
+
+    (ids, rows), (prev_ids, prev_rows) = tables[5], prev_tables[5]
+    prev = from_fixed(match_previous(ids, prev_ids, prev_rows, rows)[0])
+    world.power_up_pool.release_all(world.power_ups)
+    world.power_ups.clear()
+    for row, (prev_x, prev_y) in zip(rows.tolist(), prev.tolist()):
+        power_up = world.power_up_pool.take()
+        power_up.type = POWERUP_TYPES[row[2]]
+        power_up.x, power_up.y = row[0] / SCALE, row[1] / SCALE
+        power_up.prev_x, power_up.prev_y = prev_x, prev_y
+        power_up.speed = 2
+        power_up.width = power_up.height = 30
+        world.power_ups.append(power_up)
+
+    world.explosion_pool.release_all(world.explosions)
+    world.explosions.clear()
+    for x, y, frame, size in tables[6][1].tolist():
+        explosion = world.explosion_pool.acquire(x / SCALE, y / SCALE, size / SCALE)
+        explosion.frame = frame / SCALE
+        world.explosions.append(explosion)
+
+def parse_address(text):
+    host, _, port = text.partition(":")
+    return socket.gethostbyname(host), int(port or DEFAULT_PORT)
+
+def run_loopback(ticks, loss=0.0, latency=0.0, jitter=0.0, seed=1, policy="weave", score=0):
+    # Host and client in one process over 127.0.0.1 on a simulated clock,
+    # both driven by bots. Every state the client rebuilds is checked
+    # against what the host sent. Returns the metrics report.
+    from sweep import POLICIES
+
+    now = [0.0]
+    virtual = lambda: now[0]
+    world = GameWorld(seed, players=2)
+    world.score = score
+    host = Host(world, 0, "127.0.0.1", Link(loss, latency, jitter, 1, virtual), virtual)
+    client = Client(("127.0.0.1", host.port), Link(loss, latency, jitter, 2, virtual), virtual)
+    host_policy = POLICIES[policy](seed)
+    client_policy = POLICIES["random"](seed + 1)
+    mismatches = 0
+    for tick in range(ticks):
+        now[0] = tick / TICK_RATE
+        for checked in client.poll():
+            if not same_state(client.states[checked], host.history.get(checked, client.states[checked])):
+                mismatches += 1
+        client.update(TICK_MS)
+        client.send_input(client_policy(world))
+        host.tick(host_policy(world))
+        if world.game_over:
+            break
+    host.sock.close()
+    client.sock.close()
+    return {
+        "link": {"loss": loss, "latency_ms": latency, "jitter_ms": jitter},
+        "host": host.report(),
+        "client": client.report(),
+        "mismatches": mismatches,
+        "score": world.score,
+        "level": world.level,
+    }
+
+def run_window(args):
+    import pygame
+    from audio import load_sounds, VoiceManager
+    from controls import read_inputs
+    from render import Renderer
+    from world import WIDTH, HEIGHT
+
+    pygame.init()
+    pygame.mixer.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    renderer = Renderer(screen, asset_dir="images")
+    voices = VoiceManager(load_sounds("sounds"))
+    clock_ = pygame.time.Clock()
+    link = Link(args.loss, args.latency, args.jitter, random.randrange(2**32))
+
+    if args.mode == "host":
+        pygame.display.set_caption(f"Space Adventure - hosting on port {args.port}")
+        host = Host(GameWorld(args.seed, players=args.players), args.port, link=link)
+        client = None
+    else:
+        pygame.display.set_caption("Space Adventure - co-op")
+        host = None
+        client = Client(parse_address(args.address), link)
+    waiting = renderer.font_medium.render("Connecting...", True, (255, 255, 255))
+
+    accumulator = 0
+    delta_time = 0
+    running = True
+    while running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE:
+                    running = False
+                elif event.key == pygame.K_r and host and host.world.game_over:
+                    host.restart(GameWorld(players=args.players))
+
+        inputs = read_inputs()
+        if host:
+            world = host.world
+            accumulator += min(delta_time, 250)
+            events = []
+            while accumulator >= TICK_MS:
+                accumulator -= TICK_MS
+                host.tick(inputs)
+                events.extend(world.events)
+            alpha = accumulator / TICK_MS
+        else:
+            client.poll()
+            client.send_input(inputs)
+            events = client.take_events()
+            world = client.world if client.update(delta_time) else None
+            alpha = client.alpha
+        voices.play(events)
+
+        if world is None:
+            screen.fill((0, 0, 30))
+            screen.blit(waiting, (WIDTH // 2 - waiting.get_width() // 2, HEIGHT // 2))
+            pygame.display.flip()
+        else:
+            renderer.update(world)
+            renderer.draw(world, alpha)
+            renderer.present()
+        delta_time = clock_.tick(60)
+
+    pygame.quit()
+    report = host.report() if host else client.report()
+    print(json.dumps(report, indent=2))
+
+def main():
+    parser = argparse.ArgumentParser(description="Space Adventure co-op over UDP")
+    parser.add_argument("mode", choices=["host", "join", "loopback"])
+    parser.add_argument("address", nargs="?", help="join: host[:port]")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="host: UDP port to listen on")
+    parser.add_argument("--players", type=int, default=2, help="host: players including the host")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--loss", type=float, default=0.0, help="fraction of outgoing packets to drop")
+    parser.add_argument("--latency", type=float, default=0.0, help="one-way delay added to outgoing packets, ms")
+    parser.add_argument("--jitter", type=float, default=0.0, help="random +- variation of that delay, ms")
+    parser.add_argument("--ticks", type=int, default=3600, help="loopback: ticks to run")
+    parser.add_argument("--policy", default="weave", help="loopback: host bot policy (see sweep.py)")
+    parser.add_argument("--score", type=int, default=0, help="loopback: starting score (900 reaches the boss quickly)")
+    args = parser.parse_args()
+
+    if args.mode == "loopback":
+        report = run_loopback(args.ticks, args.loss, args.latency, args.jitter,
+                              1 if args.seed is None else args.seed, args.policy, args.score)
+        print(json.dumps(report, indent=2))
+        sys.exit(1 if report["mismatches"] or not report["client"]["states_received"] else 0)
+    if args.mode == "join" and not args.address:
+        parser.error("join needs the host's address")
+    run_window(args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+import pygame
+
+from render import TextCache
+from timing import PhaseTimer
+
+# Debug performance overlay (F3 in game.py): live FPS, a rolling frame-time
+# graph, per-phase milliseconds and entity counts. While it is hidden the
+# game loop skips all timing and no PhaseTimer is attached to the world.
+
+HISTORY = 120        # Frames kept for the graph
+REFRESH_FRAMES = 15  # Text is refreshed this often so numbers stay readable
+GRAPH_MAX_MS = 33.3  # Top of the graph (two 60 FPS frames)
+FRAME_BUDGET_MS = 1000 / 60
+
+PANEL_WIDTH = 280
+GRAPH_HEIGHT = 50
+LINE_HEIGHT = 16
+TEXT_COLOR = (220, 255, 220)
+
+class PerfOverlay:
+    def __init__(self):
+        self.enabled = False
+        self.timer = PhaseTimer(HISTORY)  # Simulation phases, attached to the world
+        self.frames = PhaseTimer(HISTORY)  # update / draw / flip of the whole frame
+        self.fps = 0.0
+        self.lines = []
+        self.frame_count = 0
+        self.font = None
+        self.text = TextCache()
+
+    def toggle(self, world):
+        self.enabled = not self.enabled
+        self.attach(world)
+
+    def attach(self, world):
+        # Call again whenever the game swaps in a new world
+        world.timer = self.timer if self.enabled else None
+
+    def record(self, update, draw, flip, fps):
+        self.frames.add("update", update)
+        self.frames.add("draw", draw)
+        self.frames.add("flip", flip)
+        self.frames.end_frame()
+        self.timer.end_frame()
+        self.fps = fps
+        self.frame_count += 1
+
+    def refresh(self, world):
+        def average(timer, name):
+            recent = list(timer.frames)[-REFRESH_FRAMES:]
+            if not recent:
+                return 0.0
+            return sum(frame.get(name, 0.0) for frame in recent) / len(recent) * 1000
+
+        frame_parts = [f"{name} {average(self.frames, name):.2f}" for name in ("update", "draw", "flip")]
+        phase_parts = [f"{name} {average(self.timer, name):.2f}" for name in self.timer.phase_names()]
+        self.lines = [
+            f"FPS {self.fps:.1f}",
+            "ms  " + "  ".join(frame_parts),
+            "sim " + "  ".join(phase_parts[:3]),
+            "    " + "  ".join(phase_parts[3:]),
+            f"bullets {len(world.bullets)}  enemy bullets {len(world.enemy_bullets)}",
+            f"enemies {len(world.enemies)}  explosions {len(world.explosions)}  particles {len(world.particle_system)}",
+        ]
+
+    def draw(self, screen, world):
+        if self.font is None:
+            pygame.font.init()
+            self.font = pygame.font.Font(None, 18)
+        if not self.lines or self.frame_count % REFRESH_FRAMES == 0:
+            self.refresh(world)
+
+        height = 8 + len(self.lines) * LINE_HEIGHT + GRAPH_HEIGHT + 8
+        panel = pygame.Rect(8, screen.get_height() - height - 8, PANEL_WIDTH, height)
+        shade = pygame.Surface(panel.size, pygame.SRCALPHA)
+        shade.fill((0, 0, 0, 170))
+        screen.blit(shade, panel)
+
+        y = panel.y + 6
+        for slot, line in enumerate(self.lines):
+            screen.blit(self.text.render(slot, self.font, line, TEXT_COLOR), (panel.x + 6, y))
+            y += LINE_HEIGHT
+
+        # Rolling frame-time graph, one column per frame, red over budget
+        graph_top = y + 4
+        graph_bottom = graph_top + GRAPH_HEIGHT
+        budget_y = graph_bottom - int(GRAPH_HEIGHT * FRAME_BUDGET_MS / GRAPH_MAX_MS)
+        pygame.draw.line(screen, (90, 90, 90), (panel.x + 6, budget_y), (panel.right - 6, budget_y))
+        x = panel.right - 6 - len(self.frames.frames) * 2
+        for frame in self.frames.frames:
+            ms = sum(frame.values()) * 1000
+            bar = min(GRAPH_HEIGHT, int(GRAPH_HEIGHT * ms / GRAPH_MAX_MS))
+            color = (255, 80, 80) if ms > FRAME_BUDGET_MS else (80, 255, 120)
+            pygame.draw.line(screen, color, (x, graph_bottom), (x, graph_bottom - bar))
+            x += 2
+        return panel
@@ -0,0 +1,83 @@
+import numpy as np
+
+# Ring-buffer particle engine. Particles live in fixed NumPy arrays; new
+# ones are written at the head and, once the buffer is full, overwrite the
+# oldest. A slot is alive while its life is above zero, so nothing is ever
+# removed or reallocated.
+
+class ParticleSystem:
+    def __init__(self, max_particles=4096):
+        self.max_particles = max_particles
+        self.head = 0   # Next slot to write
+        self.used = 0   # Slots written at least once
+        self.live = 0   # Particles alive after the last update
+        self.x = np.zeros(max_particles)
+        self.y = np.zeros(max_particles)
+        self.dx = np.zeros(max_particles)
+        self.dy = np.zeros(max_particles)
+        self.size = np.zeros(max_particles)
+        self.life = np.zeros(max_particles)
+        self.max_life = np.ones(max_particles)
+        self.color = np.zeros(max_particles, dtype=np.int32)  # Packed 0xRRGGBB
+
+    def __len__(self):
+        return self.live
+
+    def clear(self):
+        self.life[:] = 0
+        self.head = 0
+        self.used = 0
+        self.live = 0
+
+    def add_particle(self, x, y, color, size, life, dx=0, dy=0):
+        i = self.head
+        if self.life[i] <= 0:
+            self.live += 1
+        self.x[i] = x
+        self.y[i] = y
+        self.dx[i] = dx
+        self.dy[i] = dy
+        self.size[i] = size
+        self.life[i] = life
+        self.max_life[i] = life
+        self.color[i] = (color[0] << 16) | (color[1] << 8) | color[2]
+        self.head = (i + 1) % self.max_particles
+        self.used = max(self.used, i + 1)
+
+    def add_particles(self, x, y, color, sizes, lives, dxs, dys):
+        # Batched add; color is shared by the whole batch, and so are x, y,
+        # dxs and dys when they are scalars
+        count = len(sizes)
+        if not count:
+            return
+        if count > self.max_particles:
+            # Only the newest max_particles would survive anyway
+            keep = slice(-self.max_particles, None)
+            sizes, lives = sizes[keep], lives[keep]
+            x, y, dxs, dys = [value[keep] if np.ndim(value) else value for value in (x, y, dxs, dys)]
+            count = self.max_particles
+        slots = (self.head + np.arange(count)) % self.max_particles
+        self.live += int(np.count_nonzero(self.life[slots] <= 0))
+        self.x[slots] = x
+        self.y[slots] = y
+        self.dx[slots] = dxs
+        self.dy[slots] = dys
+        self.size[slots] = sizes
+        self.life[slots] = lives
+        self.max_life[slots] = lives
+        self.color[slots] = (color[0] << 16) | (color[1] << 8) | color[2]
+        self.head = int(slots[-1] + 1) % self.max_particles
+        self.used = max(self.used, int(slots.max()) + 1)
+
+    def update(self):
+        n = self.used
+        if not n:
+            return
+        # Dead slots keep drifting too; that is cheaper than masking them
+        self.x[:n] += self.dx[:n]
+        self.y[:n] += self.dy[:n]
+        self.life[:n] -= 1
+        self.live = int(np.count_nonzero(self.life[:n] > 0))
+
+    def alive_indices(self):
+        return np.flatnonzero(self.life[:self.used] > 0)
@@ -0,0 +1,106 @@
+import math
+from fractions import Fraction
+
+import numpy as np
+
+# Boss attack patterns as data. Each pattern is compiled once (per bullet
+# density) into a table of unit direction vectors for every phase it goes
+# through, so a volley is a table row handed to BulletPool.spawn_many: no
+# trigonometry and no per-projectile Python while firing.
+#
+# Angles are in degrees, 0 pointing right and 90 straight down. Pattern
+# kinds:
+#   fan    count shots, step degrees apart from start
+#   aimed  one shot straight at the target from each muzzle: count muzzles
+#          spacing pixels apart, centre first, then alternating left/right
+#   ring   count shots evenly around the boss, turned spin degrees further
+#          on every volley (a spiral), or half a gap on every other volley
+#          with stagger
+#   wave   a fan centred on straight down that sways sway degrees to either
+#          side, one full sweep every period volleys
+# density multiplies the shot count of a pattern while keeping its shape:
+# the same arc, line or ring filled in more finely. Bullet hell mode ramps
+# it up.
+
+PATTERNS = {
+    "spread": {"kind": "fan", "count": 7, "start": 30, "step": 20},
+    "aimed": {"kind": "aimed", "count": 3, "spacing": 30},
+    "spiral": {"kind": "ring", "count": 8, "spin": 10},
+    "rings": {"kind": "ring", "count": 24, "stagger": True},
+    "waves": {"kind": "wave", "count": 5, "step": 12, "sway": 50, "period": 16},
+}
+
+class Attack:
+    # A compiled pattern: dx, dy rows per phase (None for aimed patterns)
+    # and the muzzle x offsets
+    def __init__(self, name, dx, dy, muzzles):
+        self.name = name
+        self.dx = dx
+        self.dy = dy
+        self.muzzles = muzzles
+        self.count = len(muzzles)
+        self.period = 1 if dx is None else len(dx)
+
+    def volley(self, x, y, phase, aim=(0.0, 1.0)):
+        # (x, y, dx, dy) of one volley fired from (x, y), for
+        # BulletPool.spawn_many: dx is an array, the rest arrays or scalars.
+        # Aimed patterns fly along aim, a unit vector.
+        if self.dx is None:
+            return x + self.muzzles, y, np.full(self.count, aim[0]), aim[1]
+        row = phase % self.period
+        return x, y, self.dx[row], self.dy[row]
+
+def directions(angle_rows):
+    # Unit vectors for rows of angles in degrees
+    dx = np.array([[math.cos(math.radians(angle)) for angle in row] for row in angle_rows])
+    dy = np.array([[math.sin(math.radians(angle)) for angle in row] for row in angle_rows])
+    return dx, dy
+
+def compile_pattern(name, density=1):
+    spec = PATTERNS[name]
+    kind = spec["kind"]
+    if kind == "aimed":
+        pairs = (spec["count"] - 1) // 2 * density
+        spacing = spec["spacing"] / density
+        offsets = [0.0]
+        for i in range(1, pairs + 1):
+            offsets += [-spacing * i, spacing * i]
+        return Attack(name, None, None, np.array(offsets))
+
+    if kind == "fan":
+        count = (spec["count"] - 1) * density + 1
+        step = Fraction(spec["step"], density)
+        rows = [[spec["start"] + step * i for i in range(count)]]
+    elif kind == "ring":
+        count = spec["count"] * density
+        gap = Fraction(360, count)
+        spin = Fraction(spec.get("spin", 0))
+        # Phases until the ring lines up with itself again
+        period = (spin / gap).denominator if spin else 1
+        if spec.get("stagger"):
+            period = period * 2 // math.gcd(period, 2)
+        rows = []
+        for phase in range(period):
+            turn = spin * phase + (gap / 2 if spec.get("stagger") and phase % 2 else 0)
+            rows.append([turn + gap * i for i in range(count)])
+    else:  # wave
+        count = (spec["count"] - 1) * density + 1
+        step = Fraction(spec["step"], density)
+        first = -step * (count - 1) / 2
+        rows = []
+        for phase in range(spec["period"]):
+            centre = 90 + spec["sway"] * math.sin(2 * math.pi * phase / spec["period"])
+            rows.append([centre + first + step * i for i in range(count)])
+
+    dx, dy = directions([[float(angle) for angle in row] for row in rows])
+    return Attack(name, dx, dy, np.zeros(count))
+
+cache = {}
+
+def attack(name, density=1):
+    # Compiled pattern, built on first use
+    key = (name, density)
+    compiled = cache.get(key)
+    if compiled is None:
+        compiled = cache[key] = compile_pattern(name, density)
+    return compiled
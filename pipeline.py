@@ -0,0 +1,62 @@
+import queue
+import threading
+
+from timing import clock
+
+# Pipelined update and draw. A simulation thread steps the world and
+# captures frame N+1 as a RenderList while the main thread draws and flips
+# frame N, so a frame costs about max(update, draw + flip) instead of their
+# sum. pygame releases the GIL while it blits and flips, which is what
+# lets the simulation's Python code run alongside. The price is one frame
+# of extra input latency.
+#
+# Between collect() and the next submit() the simulation thread is idle and
+# the caller owns the world: that is where input, world swaps, quick saves
+# and scenario scripts go. Only the renderer's draw_frame() and present()
+# (and the debug overlay, which only reads counts) may run meanwhile.
+
+class Pipeline:
+    def __init__(self, renderer):
+        self.renderer = renderer
+        self.requests = queue.Queue()
+        self.results = queue.Queue()
+        self.pending = False
+        self.thread = threading.Thread(target=self.run, name="simulation", daemon=True)
+        self.thread.start()
+
+    def submit(self, world, inputs, dt):
+        # Start world.step(inputs, dt) and the capture of the frame after it
+        self.requests.put((world, inputs, dt))
+        self.pending = True
+
+    def collect(self):
+        # Wait for the last submit(): (RenderList, ticks run, seconds spent)
+        result = self.results.get()
+        self.pending = False
+        if isinstance(result, BaseException):
+            raise result
+        return result
+
+    def run(self):
+        renderer = self.renderer
+        while True:
+            request = self.requests.get()
+            if request is None:
+                return
+            world, inputs, dt = request
+            try:
+                start = clock()
+                ticks = world.step(inputs, dt)
+                renderer.update(world)
+                frame = renderer.capture(world)
+                self.results.put((frame, ticks, clock() - start))
+            except BaseException as e:
+                self.results.put(e)
+
+    def close(self):
+        # Finish the frame in flight (its result is dropped) and stop
+        if self.pending:
+            self.results.get()
+            self.pending = False
+        self.requests.put(None)
+        self.thread.join()
@@ -0,0 +1,35 @@
+# Free-list object pool for short-lived entities (enemies, power-ups,
+# explosions). A released object goes back on the free list and acquire()
+# re-initializes it in place through its reset() method, so steady play
+# stops allocating entities once the pool has grown to the peak live count.
+
+class Pool:
+    def __init__(self, cls):
+        self.cls = cls
+        self.free = []
+        self.created = 0  # Objects ever allocated, for soak checks
+
+    def acquire(self, *args):
+        if self.free:
+            obj = self.free.pop()
+            obj.reset(*args)
+            return obj
+        self.created += 1
+        return self.cls(*args)
+
+    def take(self):
+        # Like acquire() but skips reset(): the caller sets every field
+        # itself (snapshot restore)
+        if self.free:
+            return self.free.pop()
+        self.created += 1
+        return self.cls.__new__(self.cls)
+
+    def release(self, obj):
+        self.free.append(obj)
+
+    def release_all(self, objs):
+        self.free.extend(objs)
+
+    def __len__(self):
+        return len(self.free)
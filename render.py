@@ -0,0 +1,566 @@
+import pygame
+import random
+import math
+import numpy as np
+from collections import OrderedDict, namedtuple
+from functools import cached_property
+
+from atlas import load_atlas
+from enemies import ENEMY_SIZE
+from world import WIDTH, HEIGHT, EXPLOSION_FRAMES, POWERUP_TYPES
+
+# Drawing side of the game: procedural sprites and a Renderer that paints a
+# GameWorld onto a surface. The renderer only reads world state.
+
+BACKGROUND = (0, 0, 30)
+DIRTY_RECT_LIMIT = 1500  # Past this many rects a full flip is cheaper
+PLAYER_BULLET_COLOR = (100, 100, 255)
+ENEMY_BULLET_COLOR = (255, 90, 60)
+BULLET_GLOW = 3  # Drawn radius beyond the bullet's hit size
+PLAYER_TINTS = [(100, 160, 255), (255, 150, 60), (120, 255, 120), (255, 120, 255)]  # Co-op ship colors
+
+# Load or create images
+def create_ship_image():
+    surface = pygame.Surface((50, 50), pygame.SRCALPHA)
+    pygame.draw.polygon(surface, (0, 100, 255), [(25, 0), (0, 50), (50, 50)])
+    pygame.draw.polygon(surface, (0, 200, 255), [(25, 10), (10, 40), (40, 40)])
+    return surface
+
+def create_enemy_image(color):
+    surface = pygame.Surface((40, 40), pygame.SRCALPHA)
+    pygame.draw.circle(surface, color, (20, 20), 20)
+    pygame.draw.circle(surface, (50, 50, 50), (20, 20), 15)
+    pygame.draw.circle(surface, (200, 200, 200), (10, 10), 5)
+    return surface
+
+def create_boss_image():
+    surface = pygame.Surface((100, 100), pygame.SRCALPHA)
+    pygame.draw.circle(surface, (255, 50, 50), (50, 50), 50)
+    pygame.draw.circle(surface, (200, 0, 0), (50, 50), 40)
+    pygame.draw.circle(surface, (255, 255, 0), (30, 30), 10)
+    pygame.draw.circle(surface, (255, 255, 0), (70, 30), 10)
+    pygame.draw.rect(surface, (150, 0, 0), (30, 70, 40, 10))
+    return surface
+
+def create_powerup_image(type_):
+    surface = pygame.Surface((30, 30), pygame.SRCALPHA)
+    if type_ == "shield":
+        pygame.draw.circle(surface, (0, 150, 255), (15, 15), 15)
+        pygame.draw.circle(surface, (100, 200, 255), (15, 15), 10)
+    elif type_ == "rapid":
+        pygame.draw.circle(surface, (255, 255, 0), (15, 15), 15)
+        pygame.draw.rect(surface, (255, 150, 0), (10, 5, 10, 20))
+    elif type_ == "multi":
+        pygame.draw.circle(surface, (0, 255, 0), (15, 15), 15)
+        pygame.draw.circle(surface, (150, 255, 150), (15, 15), 10)
+        for angle in range(0, 360, 60):
+            rad = math.radians(angle)
+            x = int(15 + 12 * math.cos(rad))
+            y = int(15 + 12 * math.sin(rad))
+            pygame.draw.circle(surface, (0, 100, 0), (x, y), 3)
+    return surface
+
+def create_explosion_image(frame):
+    size = (frame + 1) * 10
+    surface = pygame.Surface((size, size), pygame.SRCALPHA)
+    pygame.draw.circle(surface, (255, 200, 50), (size//2, size//2), size//2)
+    pygame.draw.circle(surface, (255, 150, 0), (size//2, size//2), size//3)
+    pygame.draw.circle(surface, (255, 255, 200), (size//2, size//2), size//4)
+    return surface
+
+def create_explosion_images():
+    return [create_explosion_image(frame) for frame in range(EXPLOSION_FRAMES)]
+
+def create_star_image():
+    surface = pygame.Surface((3, 3), pygame.SRCALPHA)
+    pygame.draw.circle(surface, (255, 255, 255), (1, 1), 1)
+    return surface
+
+ENEMY_COLORS = [(255, 0, 0), (0, 255, 0), (255, 255, 0)]
+
+# Everything that goes into the sprite atlas: (name, generator, arguments)
+SPRITE_SPECS = (
+    [("player", create_ship_image, ()), ("boss", create_boss_image, ()), ("star", create_star_image, ())]
+    + [(f"enemy{i}", create_enemy_image, (color,)) for i, color in enumerate(ENEMY_COLORS)]
+    + [(f"powerup_{type_}", create_powerup_image, (type_,)) for type_ in POWERUP_TYPES]
+    + [(f"explosion{frame}", create_explosion_image, (frame,)) for frame in range(EXPLOSION_FRAMES)]
+)
+
+def tint_image(image, color):
+    # Recolor a sprite: each pixel becomes color scaled by its brightest channel
+    image = image.copy()
+    pixels = pygame.surfarray.pixels3d(image)
+    value = pixels.max(axis=2, keepdims=True) / 255
+    pixels[...] = (value * color).astype(np.uint8)
+    del pixels
+    return image
+
+def interpolate(entity, alpha):
+    # Position between the entity's previous and current tick
+    return (entity.prev_x + (entity.x - entity.prev_x) * alpha,
+            entity.prev_y + (entity.y - entity.prev_y) * alpha)
+
+class Starfield:
+    # Parallax starfield pre-rendered into one vertically tiling layer per
+    # speed band. Scrolling a layer is two blits, so the per-frame cost
+    # depends on the band count, not on how many stars there are. Stars are
+    # placed by their own RNG so a seed gives the same sky every time.
+    def __init__(self, star_count=100, bands=3, min_speed=0.1, max_speed=1.0, seed=0):
+        rng = random.Random(seed)
+        self.layers = []
+        band_width = (max_speed - min_speed) / bands
+        for band in range(bands):
+            layer = pygame.Surface((WIDTH, HEIGHT))
+            if band == 0:
+                layer.fill(BACKGROUND)  # The slowest layer doubles as the backdrop
+            else:
+                layer.set_colorkey((0, 0, 0))
+            for _ in range(star_count // bands + (band < star_count % bands)):
+                radius = int(rng.uniform(0.5, 2.0))
+                if radius < 1:
+                    continue
+                brightness = rng.randint(100, 255)
+                x = rng.randint(0, WIDTH)
+                y = rng.randint(0, HEIGHT - 1)
+                # Draw wrapped copies so the seam at the tile edge is invisible
+                for wrap in (-HEIGHT, 0, HEIGHT):
+                    pygame.draw.circle(layer, (brightness, brightness, brightness), (x, y + wrap), radius)
+            speed = min_speed + band_width * (band + 0.5)
+            self.layers.append([layer, speed, 0.0])
+
+    def scroll(self, ticks=1):
+        for layer in self.layers:
+            layer[2] = (layer[2] + layer[1] * ticks) % HEIGHT
+
+    def blits(self):
+        blits = []
+        for layer, speed, offset in self.layers:
+            y = int(offset)
+            blits.append((layer, (0, y)))
+            blits.append((layer, (0, y - HEIGHT)))
+        return tuple(blits)
+
+    def draw(self, screen):
+        screen.blits(self.blits(), False)
+
+class CircleSpriteCache:
+    # Pre-rendered translucent circles keyed by (color, radius, alpha), with
+    # alpha quantized so a fading particle only walks through a few sprites.
+    # Keys are packed into one int so they can be built with NumPy.
+    ALPHA_LEVELS = 16
+
+    def __init__(self):
+        self.sprites = {}
+
+    def quantize_alpha(self, alpha):
+        step = 255 // (self.ALPHA_LEVELS - 1)
+        return ((alpha + step // 2) // step).astype(np.int64) * step
+
+    def keys(self, colors, radii, alphas):
+        return (colors.astype(np.int64) << 16) | (radii << 8) | alphas
+
+    def get(self, key):
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            color = ((key >> 32) & 255, (key >> 24) & 255, (key >> 16) & 255, key & 255)
+            radius = (key >> 8) & 255
+            sprite = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+            pygame.draw.circle(sprite, color, (radius, radius), radius)
+            self.sprites[key] = sprite
+        return sprite
+
+class ScaledSpriteCache:
+    # LRU-bounded cache of scaled sprites keyed by (sprite id, scale), so a
+    # sprite is scaled once per distinct size instead of every frame
+    def __init__(self, max_entries=64):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+
+    def get(self, sprite_id, image, scale):
+        key = (sprite_id, scale)
+        scaled = self.entries.get(key)
+        if scaled is not None:
+            self.entries.move_to_end(key)
+            return scaled
+        if scale == 1.0:
+            scaled = image
+        else:
+            width, height = image.get_size()
+            scaled = pygame.transform.scale(image, (int(width * scale), int(height * scale)))
+        self.entries[key] = scaled
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return scaled
+
+class TextCache:
+    # One cached surface per HUD slot, re-rendered only when its text changes
+    def __init__(self):
+        self.slots = {}
+
+    def render(self, slot, font, text, color):
+        entry = self.slots.get(slot)
+        if entry is not None and entry[0] == text:
+            return entry[1]
+        surface = font.render(text, True, color)
+        self.slots[slot] = (text, surface)
+        return surface
+
+def draw_loading(screen, font, progress):
+    # Loading screen game.py shows while sprites and sounds load
+    screen.fill(BACKGROUND)
+    text = font.render("Loading...", True, (255, 255, 255))
+    screen.blit(text, text.get_rect(center=(WIDTH // 2, HEIGHT // 2 - 20)))
+    bar = pygame.Rect(WIDTH // 4, HEIGHT // 2 + 10, WIDTH // 2, 12)
+    pygame.draw.rect(screen, (255, 255, 255), bar, 1)
+    pygame.draw.rect(screen, (255, 255, 255), (bar.x + 2, bar.y + 2, int((bar.width - 4) * progress), bar.height - 4))
+
+# One captured frame. commands are drawn in order:
+#   ("blits", ((surface, (x, y)), ...))    many sprites in one call
+#   ("blit", surface, (x, y))
+#   ("rect", color, rect)
+#   ("circle", color, center, radius, width)
+# Sprites are resolved to their pre-rendered surface for the sprite, scale
+# and alpha when captured, so drawing is blits and nothing else. events are
+# the sound cues of the ticks that led to the frame.
+RenderList = namedtuple("RenderList", ("ticks", "commands", "events"))
+
+class Renderer:
+    def __init__(self, screen, dirty_rects=False, star_count=100, asset_dir=None, star_seed=0):
+        self.screen = screen
+
+        # Dirty-rect mode only uploads the areas drawn this frame and last
+        # frame; otherwise present() flips the whole screen
+        self.dirty_rects = dirty_rects
+        self.full_redraw = True
+        self.rects = []
+        self.last_rects = []
+        self.alpha = 1.0
+        self.last_ticks = 0
+
+        # Load images: all sprites live in one display-format atlas, cached
+        # in asset_dir (if given) between runs
+        self.atlas = load_atlas(SPRITE_SPECS, asset_dir)
+        self.player_img = self.atlas["player"]
+        self.player_imgs = [self.player_img]
+        for tint in PLAYER_TINTS[1:]:
+            self.player_imgs.append(tint_image(self.player_img, tint))
+        self.enemy_imgs = [self.atlas[f"enemy{i}"] for i in range(len(ENEMY_COLORS))]
+        self.boss_img = self.atlas["boss"]
+        self.powerup_imgs = {type_: self.atlas[f"powerup_{type_}"] for type_ in POWERUP_TYPES}
+        self.explosion_imgs = [self.atlas[f"explosion{frame}"] for frame in range(EXPLOSION_FRAMES)]
+        self.star_img = self.atlas["star"]
+
+        self.starfield = Starfield(star_count, seed=star_seed)
+        # Dirty-rect mode keeps the starfield still: scrolling it would
+        # dirty the whole screen every frame
+        self.background = pygame.Surface((WIDTH, HEIGHT))
+        self.starfield.draw(self.background)
+        self.particle_sprites = CircleSpriteCache()
+        self.bullet_sprites = {}
+        self.scaled_sprites = ScaledSpriteCache()
+
+        self.text = TextCache()
+        self.commands = None  # Being filled by capture()
+
+    # UI elements, built on first use: font setup is off the startup path
+    # and renderers that never draw the HUD never pay for it. Font(None, ...)
+    # is the bundled default font that SysFont(None, ...) resolves to, without
+    # first scanning the system's fonts.
+    @cached_property
+    def font_large(self):
+        pygame.font.init()
+        return pygame.font.Font(None, 72)
+
+    @cached_property
+    def font_medium(self):
+        pygame.font.init()
+        return pygame.font.Font(None, 36)
+
+    @cached_property
+    def font_small(self):
+        pygame.font.init()
+        return pygame.font.Font(None, 24)
+
+    @cached_property
+    def static_text(self):
+        # Constant strings are rendered once; HUD values only when they change
+        return {
+            "rapid": self.font_small.render("RAPID FIRE", True, (255, 255, 0)),
+            "multi": self.font_small.render("MULTI SHOT", True, (0, 255, 0)),
+            "victory": self.font_medium.render("YOU'VE SAVED THE GALAXY!", True, (255, 255, 255)),
+            "game_over": self.font_large.render("GAME OVER", True, (255, 0, 0)),
+            "restart": self.font_medium.render("Press R to restart", True, (255, 255, 255))
+        }
+
+    def update(self, world):
+        # Update stars for parallax effect, by simulated ticks so the
+        # scroll speed does not depend on the render frame rate
+        ticks = world.ticks - self.last_ticks
+        self.last_ticks = world.ticks
+        if ticks > 0 and not self.dirty_rects:
+            self.starfield.scroll(ticks)
+
+    def draw(self, world, alpha=None):
+        # alpha blends positions between the previous and the current tick;
+        # by default the fraction of a tick the world's last step() left over
+        self.draw_frame(self.capture(world, alpha))
+
+    def capture(self, world, alpha=None):
+        # Everything this frame draws, as a RenderList that no longer refers
+        # to the world. Runs on the simulation thread in pipelined mode.
+        if alpha is None:
+            alpha = world.alpha
+        self.alpha = alpha
+        self.commands = []
+        if not self.dirty_rects:
+            # Background and stars
+            self.commands.append(("blits", self.starfield.blits()))
+
+        # Draw UI
+        if not world.game_over:
+            self.add_hud(world)
+
+            # Draw particles
+            self.add_particles(world.particle_system)
+
+            # Draw game objects
+            self.add_bullets(world.bullets, PLAYER_BULLET_COLOR)
+            self.add_bullets(world.enemy_bullets, ENEMY_BULLET_COLOR)
+
+            self.add_enemies(world.enemies)
+
+            if world.boss:
+                self.add_boss(world.boss)
+
+            if world.power_ups:
+                blits = []
+                for power_up in world.power_ups:
+                    x, y = interpolate(power_up, alpha)
+                    blits.append((self.powerup_imgs[power_up.type], (x - power_up.width//2, y - power_up.height//2)))
+                self.commands.append(("blits", tuple(blits)))
+
+            for explosion in world.explosions:
+                self.add_explosion(explosion)
+
+            for player in world.players:
+                if player.alive:
+                    self.add_player(player, world.ticks)
+        else:
+            self.add_game_over(world)
+
+        commands = tuple(self.commands)
+        self.commands = None
+        return RenderList(world.ticks, commands, tuple(world.events))
+
+    def draw_frame(self, frame):
+        # Paint a captured RenderList onto the screen
+        # Without dirty rects the list starts with the starfield, which
+        # covers the whole screen
+        screen = self.screen
+        if self.dirty_rects:
+            if self.full_redraw:
+                screen.blit(self.background, (0, 0))
+            else:
+                # Erase only what was drawn last frame
+                background = self.background
+                for rect in self.last_rects:
+                    screen.blit(background, rect, rect)
+        rects = self.rects = []
+
+        # Only dirty-rect mode needs the touched areas back
+        dirty = self.dirty_rects
+        blits = screen.blits
+        for command in frame.commands:
+            kind = command[0]
+            if kind == "blits":
+                touched = blits(command[1], dirty)
+                if touched:
+                    rects.extend(touched)
+            elif kind == "blit":
+                rects.append(screen.blit(command[1], command[2]))
+            elif kind == "rect":
+                rects.append(pygame.draw.rect(screen, command[1], command[2]))
+            else:
+                rects.append(pygame.draw.circle(screen, command[1], command[2], command[3], command[4]))
+
+    def draw_overlay(self, overlay, world):
+        # Debug overlay on top of the finished frame
+        self.rects.append(overlay.draw(self.screen, world))
+
+    def present(self):
+        # Push the frame to the display: the dirty rects of this frame and
+        # the last one (to clear what moved away), or a full flip
+        if not self.dirty_rects or self.full_redraw:
+            pygame.display.flip()
+            self.full_redraw = False
+        elif len(self.rects) + len(self.last_rects) > DIRTY_RECT_LIMIT:
+            # So much changed that one full upload is cheaper
+            pygame.display.flip()
+        else:
+            pygame.display.update(self.last_rects + self.rects)
+        self.last_rects = self.rects
+
+    def blit(self, image, position):
+        self.commands.append(("blit", image, position))
+
+    def rect(self, color, rect):
+        self.commands.append(("rect", color, rect))
+
+    def add_hud(self, world):
+        player = world.player
+
+        # Score and level
+        score_text = self.text.render("score", self.font_medium, f"Score: {world.score}", (255, 255, 255))
+        level_text = self.text.render("level", self.font_medium, f"Level: {world.level}", (255, 255, 255))
+        self.blit(score_text, (10, 10))
+        self.blit(level_text, (10, 50))
+
+        # Lives
+        lives_text = self.text.render("lives", self.font_medium, f"Lives: {player.lives}", (255, 255, 255))
+        self.blit(lives_text, (WIDTH - 150, 10))
+
+        # Health bar
+        health_width = 150
+        health_height = 20
+        self.rect((100, 100, 100), (WIDTH - 160, 50, health_width, health_height))
+        self.rect((0, 255, 0), (WIDTH - 160, 50, health_width * player.health / 100, health_height))
+
+        # Shield bar if active
+        if player.shield > 0:
+            self.rect((100, 100, 100), (WIDTH - 160, 75, health_width, health_height))
+            self.rect((0, 150, 255), (WIDTH - 160, 75, health_width * player.shield / 100, health_height))
+
+        # Power-up indicators
+        if player.rapid_fire:
+            rapid_text = self.static_text["rapid"]
+            self.blit(rapid_text, (WIDTH - 150, 100))
+
+        if player.multi_shot:
+            multi_text = self.static_text["multi"]
+            self.blit(multi_text, (WIDTH - 150, 125))
+
+        # Other co-op players: lives and health along the bottom right
+        for player in world.players[1:]:
+            y = HEIGHT - 30 * player.index
+            label = self.text.render(f"p{player.index}", self.font_small, f"P{player.index + 1} x{player.lives}", PLAYER_TINTS[player.index % len(PLAYER_TINTS)])
+            self.blit(label, (WIDTH - 230, y))
+            self.rect((100, 100, 100), (WIDTH - 160, y, health_width, 10))
+            self.rect((0, 255, 0), (WIDTH - 160, y, health_width * max(player.health, 0) / 100, 10))
+
+        # Level transition message
+        if world.boss_killed:
+            level_up_text = self.text.render("level_up", self.font_large, f"LEVEL {world.level} COMPLETE!", (255, 255, 255))
+            self.blit(level_up_text, (WIDTH//2 - level_up_text.get_width()//2, HEIGHT//2 - level_up_text.get_height()//2))
+
+            if world.level < 10:  # Max 10 levels
+                next_level_text = self.text.render("next_level", self.font_medium, f"PREPARE FOR LEVEL {world.level + 1}", (255, 255, 255))
+                self.blit(next_level_text, (WIDTH//2 - next_level_text.get_width()//2, HEIGHT//2 + 50))
+            else:
+                victory_text = self.static_text["victory"]
+                self.blit(victory_text, (WIDTH//2 - victory_text.get_width()//2, HEIGHT//2 + 50))
+
+    def add_game_over(self, world):
+        # Game over screen
+        game_over_text = self.static_text["game_over"]
+        final_score_text = self.text.render("final_score", self.font_medium, f"Final Score: {world.score}", (255, 255, 255))
+        restart_text = self.static_text["restart"]
+
+        self.blit(game_over_text, (WIDTH//2 - game_over_text.get_width()//2, HEIGHT//2 - 100))
+        self.blit(final_score_text, (WIDTH//2 - final_score_text.get_width()//2, HEIGHT//2))
+        self.blit(restart_text, (WIDTH//2 - restart_text.get_width()//2, HEIGHT//2 + 50))
+
+    def add_player(self, player, ticks):
+        x, y = interpolate(player, self.alpha)
+
+        # Draw player
+        image = self.player_imgs[player.index % len(self.player_imgs)]
+        self.blit(image, (x - player.width//2, y - player.height//2))
+
+        # Draw shield if active
+        if player.shield > 0:
+            self.commands.append(("circle", (0, 150, 255, 128), (x, y), player.width, 3))
+
+        # Flash if invincible (200 ms period, on the simulation clock)
+        if player.invincible and ticks % 12 < 6:
+            s = pygame.Surface((player.width, player.height), pygame.SRCALPHA)
+            s.fill((255, 255, 255, 128))
+            self.blit(s, (x - player.width//2, y - player.height//2))
+
+    def bullet_sprite(self, radius, color):
+        key = (radius, color)
+        sprite = self.bullet_sprites.get(key)
+        if sprite is None:
+            sprite = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+            pygame.draw.circle(sprite, color, (radius, radius), radius)
+            self.bullet_sprites[key] = sprite
+        return sprite
+
+    def add_bullets(self, bullets, color):
+        n = bullets.count
+        if not n:
+            return
+        # Bullets fly straight, so step them back along their velocity
+        # instead of keeping previous positions
+        back = (1 - self.alpha) * bullets.speed[:n]
+        xs = (bullets.x[:n] - bullets.dx[:n] * back).astype(int).tolist()
+        ys = (bullets.y[:n] - bullets.dy[:n] * back).astype(int).tolist()
+        # Each bullet is its glow circle, which covers the core; one
+        # pre-rendered sprite per radius, all blitted in a single call
+        radii = (bullets.size[:n].astype(int) + BULLET_GLOW).tolist()
+        sprites = {}
+        blits = []
+        for x, y, radius in zip(xs, ys, radii):
+            sprite = sprites.get(radius)
+            if sprite is None:
+                sprite = sprites[radius] = self.bullet_sprite(radius, color)
+            blits.append((sprite, (x - radius, y - radius)))
+        self.commands.append(("blits", tuple(blits)))
+
+    def add_enemies(self, enemies):
+        n = enemies.count
+        if not n:
+            return
+        alpha = self.alpha
+        half = ENEMY_SIZE // 2
+        prev_x = enemies.prev_x[:n]
+        prev_y = enemies.prev_y[:n]
+        xs = (prev_x + (enemies.x[:n] - prev_x) * alpha - half).tolist()
+        ys = (prev_y + (enemies.y[:n] - prev_y) * alpha - half).tolist()
+        images = self.enemy_imgs
+        self.commands.append(("blits", tuple([(images[type_], (x, y)) for type_, x, y in zip(enemies.type[:n].tolist(), xs, ys)])))
+
+    def add_boss(self, boss):
+        x, y = interpolate(boss, self.alpha)
+        self.blit(self.boss_img, (x - boss.width//2, y - boss.height//2))
+
+        # Health bar
+        bar_width = 200
+        bar_height = 10
+        bar_x = WIDTH//2 - bar_width//2
+        bar_y = 20
+        self.rect((100, 100, 100), (bar_x, bar_y, bar_width, bar_height))
+        health_width = int(bar_width * (boss.health / boss.max_health))
+        self.rect((255, 0, 0), (bar_x, bar_y, health_width, bar_height))
+
+    def add_explosion(self, explosion):
+        idx = min(int(explosion.frame), explosion.max_frame)
+        scaled_img = self.scaled_sprites.get(("explosion", idx), self.explosion_imgs[idx], explosion.size)
+        self.blit(scaled_img, (explosion.x - scaled_img.get_width()//2, explosion.y - scaled_img.get_height()//2))
+
+    def add_particles(self, particle_system):
+        alive = particle_system.alive_indices()
+        if not len(alive):
+            return
+        ratio = particle_system.life[alive] / particle_system.max_life[alive]
+        size = particle_system.size[alive] * ratio
+        radius = size.astype(np.int64)
+        alpha = self.particle_sprites.quantize_alpha(255 * ratio)
+        visible = (radius >= 1) & (alpha > 0)
+        if not visible.any():
+            return
+        keys = self.particle_sprites.keys(particle_system.color[alive][visible], radius[visible], alpha[visible])
+        back = 1 - self.alpha
+        xs = (particle_system.x[alive] - particle_system.dx[alive] * back - size)[visible].astype(int).tolist()
+        ys = (particle_system.y[alive] - particle_system.dy[alive] * back - size)[visible].astype(int).tolist()
+        sprite = self.particle_sprites.get
+        self.commands.append(("blits", tuple([(sprite(key), (x, y)) for key, x, y in zip(keys.tolist(), xs, ys)])))
@@ -0,0 +1,159 @@
+import argparse
+import struct
+import time
+
+from world import GameWorld
+
+# Session recording and playback. A session is the RNG seed plus the input
+# bitmask of every tick; since the simulation is deterministic that is all
+# it takes to reproduce it exactly. On disk the inputs are run-length
+# encoded (held keys produce long runs), so a typical session is a few
+# bytes per second of play.
+#
+# File layout (little endian):
+#   header  magic "SARP", u8 version, u64 seed, u32 tick count, u8 flags
+#           (FLAG_BULLET_HELL)
+#   runs    u8 input bitmask, LEB128 varint run length, until tick count
+
+MAGIC = b"SARP"
+VERSION = 4  # 2: boss fire split from player bullets, 3: timers moved onto the
+# tick scheduler, 4: data-driven boss patterns
+HEADER = struct.Struct("<4sBQIB")
+FLAG_BULLET_HELL = 1
+
+class ReplayError(Exception):
+    pass
+
+def write_varint(out, value):
+    while value >= 0x80:
+        out.append((value & 0x7f) | 0x80)
+        value >>= 7
+    out.append(value)
+
+def read_varint(data, pos):
+    value = 0
+    shift = 0
+    while True:
+        if pos >= len(data):
+            raise ReplayError("truncated replay")
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+class Recorder:
+    def __init__(self, seed, bullet_hell=False):
+        self.seed = seed
+        self.bullet_hell = bullet_hell
+        self.runs = []  # [inputs, tick count]
+        self.ticks = 0
+
+    def record(self, inputs, ticks=1):
+        # Log inputs as held for the given number of ticks
+        if ticks <= 0:
+            return
+        if self.runs and self.runs[-1][0] == inputs:
+            self.runs[-1][1] += ticks
+        else:
+            self.runs.append([inputs, ticks])
+        self.ticks += ticks
+
+    def to_bytes(self):
+        flags = FLAG_BULLET_HELL if self.bullet_hell else 0
+        out = bytearray(HEADER.pack(MAGIC, VERSION, self.seed, self.ticks, flags))
+        for inputs, count in self.runs:
+            out.append(inputs)
+            write_varint(out, count)
+        return bytes(out)
+
+    def save(self, path):
+        # Encode first so a failure leaves no half-written file behind
+        data = self.to_bytes()
+        with open(path, "wb") as f:
+            f.write(data)
+
+class Replay:
+    def __init__(self, seed, runs, bullet_hell=False):
+        self.seed = seed
+        self.runs = runs
+        self.bullet_hell = bullet_hell
+        self.ticks = sum(count for _, count in runs)
+
+    @classmethod
+    def from_bytes(cls, data):
+        # The version comes first: older headers have a different size
+        if len(data) < 5 or data[:4] != MAGIC:
+            raise ReplayError("not a replay file")
+        if data[4] != VERSION:
+            raise ReplayError(f"unsupported replay version {data[4]}")
+        if len(data) < HEADER.size:
+            raise ReplayError("truncated replay")
+        magic, version, seed, ticks, flags = HEADER.unpack_from(data)
+        runs = []
+        pos = HEADER.size
+        total = 0
+        while total < ticks:
+            if pos >= len(data):
+                raise ReplayError("truncated replay")
+            inputs = data[pos]
+            count, pos = read_varint(data, pos + 1)
+            runs.append((inputs, count))
+            total += count
+        return cls(seed, runs, bool(flags & FLAG_BULLET_HELL))
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+    def inputs(self):
+        # Per-tick input bitmasks
+        for inputs, count in self.runs:
+            for _ in range(count):
+                yield inputs
+
+    def play(self, world=None, to_tick=None):
+        # Headless fast-forward: run the replay (or its first to_tick ticks)
+        # as fast as the CPU allows. Starts a fresh world from the recorded
+        # seed unless one is given to continue.
+        if world is None:
+            world = GameWorld(self.seed, bullet_hell=self.bullet_hell)
+        if to_tick is None:
+            to_tick = self.ticks
+        remaining = to_tick - world.ticks
+        skip = world.ticks
+        tick = world.tick
+        for inputs, count in self.runs:
+            if skip >= count:
+                skip -= count
+                continue
+            count -= skip
+            skip = 0
+            for _ in range(min(count, remaining)):
+                tick(inputs)
+            remaining -= count
+            if remaining <= 0:
+                break
+        return world
+
+def main():
+    parser = argparse.ArgumentParser(description="Fast-forward a recorded Space Adventure session")
+    parser.add_argument("path", help="replay file written with game.py --record")
+    parser.add_argument("--to", type=int, default=None, help="stop at this tick")
+    args = parser.parse_args()
+
+    replay = Replay.load(args.path)
+    start = time.perf_counter()
+    world = replay.play(to_tick=args.to)
+    elapsed = time.perf_counter() - start
+
+    print(f"seed {replay.seed}, {replay.ticks} ticks recorded")
+    print(f"tick {world.ticks}: score {world.score}, level {world.level}, "
+          f"lives {world.player.lives}, game over {world.game_over}")
+    if elapsed > 0:
+        print(f"simulated at {world.ticks / elapsed:.0f} ticks/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+import heapq
+
+# Tick-based event scheduler: a binary heap of (tick, sequence, handle).
+# Running it costs O(log n) per event that is due and nothing per pending
+# event, so a timer is free until it fires. Events due on the same tick run
+# in the order they were scheduled. Cancelling is O(1): the entry is only
+# marked and dropped when it reaches the top of the heap (or in a cleanup
+# pass once cancelled entries dominate).
+
+class Handle:
+    __slots__ = ("tick", "seq", "callback", "args", "cancelled")
+
+    def __init__(self, tick, seq, callback, args):
+        self.tick = tick
+        self.seq = seq
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+    def __repr__(self):
+        state = " cancelled" if self.cancelled else ""
+        return f"<Handle tick {self.tick} {getattr(self.callback, '__name__', self.callback)}{state}>"
+
+class Scheduler:
+    def __init__(self):
+        self.queue = []
+        self.now = 0
+        self.seq = 0
+        self.cancelled = 0  # Cancelled entries still in the heap
+
+    def at(self, tick, callback, *args):
+        # Run callback(*args) when run_due reaches tick; returns a handle
+        # that can cancel it
+        handle = Handle(tick, self.seq, callback, args)
+        self.seq += 1
+        heapq.heappush(self.queue, (tick, handle.seq, handle))
+        return handle
+
+    def after(self, ticks, callback, *args):
+        return self.at(self.now + ticks, callback, *args)
+
+    def cancel(self, handle):
+        # Safe to call with None or an already fired/cancelled handle
+        if handle is None or handle.cancelled or handle.seq < 0:
+            return
+        handle.cancelled = True
+        self.cancelled += 1
+        if self.cancelled > 64 and self.cancelled > len(self.queue) // 2:
+            # In place: run_due may be iterating this very list
+            self.queue[:] = [entry for entry in self.queue if not entry[2].cancelled]
+            heapq.heapify(self.queue)
+            self.cancelled = 0
+
+    def run_due(self, tick):
+        # Fire every event due at or before tick, in (tick, schedule) order.
+        # Callbacks may schedule more events, including for this tick.
+        self.now = tick
+        queue = self.queue
+        while queue and queue[0][0] <= tick:
+            handle = heapq.heappop(queue)[2]
+            if handle.cancelled:
+                self.cancelled -= 1
+                continue
+            handle.seq = -1  # Fired; cancel() is now a no-op
+            handle.callback(*handle.args)
+
+    def pending(self):
+        # Live handles, soonest first (for inspection and tests)
+        return [entry[2] for entry in sorted(self.queue) if not entry[2].cancelled]
+
+    def __len__(self):
+        return len(self.queue) - self.cancelled
@@ -0,0 +1,90 @@
+import numpy as np
+
+# Uniform-grid spatial hash used as the collision broadphase. Points are
+# binned by cell key and sorted once per rebuild, leaving every occupied cell
+# as one contiguous run of point indices; a query stitches together the runs
+# of the cells it overlaps. Every point lives in exactly one cell, so callers
+# widen the query radius by the largest point radius they store.
+
+ROWS = 1 << 16      # Key stride per grid column
+ROW_OFFSET = 1 << 15  # Keeps negative row indices positive inside a column
+
+EMPTY = np.empty(0, dtype=np.intp)
+
+class SpatialHash:
+    def __init__(self, cell_size=64):
+        self.cell_size = cell_size
+        self.order = EMPTY
+        self.cells = {}
+        self.keys = EMPTY  # Sorted keys of the occupied cells
+
+    def clear(self):
+        self.order = EMPTY
+        self.cells = {}
+        self.keys = EMPTY
+
+    def rebuild(self, xs, ys):
+        size = self.cell_size
+        cx = np.floor_divide(xs, size).astype(np.int64)
+        cy = np.floor_divide(ys, size).astype(np.int64)
+        keys = cx * ROWS + (cy + ROW_OFFSET)
+        order = np.argsort(keys, kind="stable")
+        keys = keys[order]
+        self.order = order
+        if not len(keys):
+            self.cells = {}
+            self.keys = EMPTY
+            return
+        # Start offset of each run of equal keys
+        starts = np.flatnonzero(np.diff(keys)) + 1
+        bounds = [0] + starts.tolist() + [len(keys)]
+        self.keys = keys[bounds[:-1]]
+        self.cells = dict(zip(self.keys.tolist(), zip(bounds[:-1], bounds[1:])))
+
+    def query(self, x, y, radius):
+        # Indices of every point in the cells overlapping the square
+        # around (x, y)
+        cells = self.cells
+        if not cells:
+            return EMPTY
+        size = self.cell_size
+        x0 = int((x - radius) // size)
+        x1 = int((x + radius) // size)
+        y0 = int((y - radius) // size) + ROW_OFFSET
+        y1 = int((y + radius) // size) + ROW_OFFSET
+        runs = []
+        for cx in range(x0, x1 + 1):
+            column = cx * ROWS
+            for cy in range(y0, y1 + 1):
+                run = cells.get(column + cy)
+                if run:
+                    runs.append(self.order[run[0]:run[1]])
+        if not runs:
+            return EMPTY
+        if len(runs) == 1:
+            return runs[0]
+        return np.concatenate(runs)
+
+    def touches(self, xs, ys, radius):
+        # Vectorized pre-filter for many queries at once: True where the
+        # square around (x, y) overlaps at least one occupied cell, i.e.
+        # where query() could return anything
+        result = np.zeros(len(xs), dtype=bool)
+        keys = self.keys
+        if not len(keys) or not len(xs):
+            return result
+        size = self.cell_size
+        x0 = np.floor_divide(xs - radius, size).astype(np.int64)
+        x1 = np.floor_divide(xs + radius, size).astype(np.int64)
+        y0 = np.floor_divide(ys - radius, size).astype(np.int64)
+        y1 = np.floor_divide(ys + radius, size).astype(np.int64)
+        span = int(2 * radius // size) + 1  # Most cells a square can cross per axis
+        for i in range(span + 1):
+            cx = x0 + i
+            in_x = cx <= x1
+            for j in range(span + 1):
+                cy = y0 + j
+                key = cx * ROWS + (cy + ROW_OFFSET)
+                slot = np.minimum(np.searchsorted(keys, key), len(keys) - 1)
+                result |= in_x & (cy <= y1) & (keys[slot] == key)
+        return result
@@ -0,0 +1,202 @@
+import argparse
+import itertools
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from world import (
+    GameWorld, TICK_RATE,
+    INPUT_LEFT, INPUT_RIGHT, INPUT_UP, INPUT_DOWN, INPUT_FIRE,
+)
+
+# Balancing sweeps: play many complete headless games in parallel with
+# scripted policies over a grid of tuning parameters, streaming one JSON
+# line per game as it finishes.
+#
+#   python sweep.py --games 20 --policy weave --policy dodge \
+#       --set spawn_rate=1000,700,400 --set power_up_chance=0.1,0.2,0.4 \
+#       --out sweep.jsonl
+
+MAX_MINUTES = 10  # Default cap on a single game, in simulated minutes
+
+# Policies: built per game from a seed, called once per tick with the world
+# and returning the input bitmask for that tick
+
+def idle_policy(seed):
+    return lambda world: 0
+
+def fire_policy(seed):
+    return lambda world: INPUT_FIRE
+
+def weave(tick):
+    # Fire while sweeping left and right; also scripts benchmarks/scenarios.py
+    return INPUT_FIRE | (INPUT_LEFT if (tick // 60) % 2 else INPUT_RIGHT)
+
+def weave_policy(seed):
+    return lambda world: weave(world.ticks)
+
+def random_policy(seed):
+    # Mash random directions, holding each for a random stretch
+    rng = random.Random(seed)
+    held = [0, 0]  # inputs, ticks left
+
+    def policy(world):
+        if held[1] <= 0:
+            held[0] = rng.choice([0, INPUT_LEFT, INPUT_RIGHT, INPUT_UP, INPUT_DOWN]) | INPUT_FIRE
+            held[1] = rng.randint(5, 40)
+        held[1] -= 1
+        return held[0]
+    return policy
+
+def dodge_policy(seed):
+    # Fire constantly, line up under the nearest enemy (or the boss) and
+    # sidestep the closest threat coming down on the player
+    def policy(world):
+        player = world.player
+        inputs = INPUT_FIRE
+
+        threat = None
+        threat_distance = 150 ** 2
+        bullets = world.enemy_bullets
+        for i in range(bullets.count):
+            dx = bullets.x[i] - player.x
+            dy = bullets.y[i] - player.y
+            if dy < 0 and dx * dx + dy * dy < threat_distance:
+                threat = bullets.x[i]
+                threat_distance = dx * dx + dy * dy
+        for enemy in world.enemies:
+            dx = enemy.x - player.x
+            dy = enemy.y - player.y
+            if dy < 0 and dx * dx + dy * dy < threat_distance:
+                threat = enemy.x
+                threat_distance = dx * dx + dy * dy
+        if threat is not None:
+            return inputs | (INPUT_LEFT if threat > player.x else INPUT_RIGHT)
+
+        target = world.boss or min(world.enemies, key=lambda e: -e.y, default=None)
+        if target is not None:
+            if target.x > player.x + 5:
+                inputs |= INPUT_RIGHT
+            elif target.x < player.x - 5:
+                inputs |= INPUT_LEFT
+        return inputs
+    return policy
+
+POLICIES = {
+    "idle": idle_policy,
+    "fire": fire_policy,
+    "weave": weave_policy,
+    "random": random_policy,
+    "dodge": dodge_policy,
+}
+
+# Tunable parameters: name -> (type, apply(world, value))
+
+def set_spawn_rate(world, value):
+    world.spawn_rate_base = value
+    world.spawn_rate_floor = min(world.spawn_rate_floor, value)
+    world.set_spawn_rate(value)
+
+PARAMETERS = {
+    "spawn_rate": (float, set_spawn_rate),
+    "spawn_rate_floor": (float, lambda world, value: setattr(world, "spawn_rate_floor", value)),
+    "boss_health": (int, lambda world, value: setattr(world, "boss_health_per_level", value)),
+    "power_up_chance": (float, lambda world, value: setattr(world, "power_up_chance", value)),
+    "fire_rate": (float, lambda world, value: setattr(world, "fire_rate", value)),
+    "rapid_fire_rate": (float, lambda world, value: setattr(world, "rapid_fire_rate", value)),
+}
+
+def run_game(policy_name, seed, params, max_ticks):
+    # Play one game to game over or max_ticks; runs in a worker process
+    world = GameWorld(seed)
+    for name, value in params.items():
+        PARAMETERS[name][1](world, value)
+    policy = POLICIES[policy_name](seed)
+
+    start = time.perf_counter()
+    tick = world.tick
+    while not world.game_over and world.ticks < max_ticks:
+        tick(policy(world))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "policy": policy_name,
+        "seed": seed,
+        "params": params,
+        "level": world.level,
+        "score": world.score,
+        "ticks": world.ticks,
+        "died": world.game_over,
+        "time_to_death": world.ticks / TICK_RATE if world.game_over else None,
+        "ticks_per_second": world.ticks / elapsed if elapsed > 0 else None,
+    }
+
+def parse_setting(parser, text):
+    name, sep, values = text.partition("=")
+    if not sep or name not in PARAMETERS:
+        parser.error(f"--set expects NAME=V1,V2,... with NAME one of {', '.join(PARAMETERS)}")
+    convert = PARAMETERS[name][0]
+    try:
+        return name, [convert(value) for value in values.split(",")]
+    except ValueError:
+        parser.error(f"bad value in --set {text}")
+
+def make_jobs(policies, settings, games, seed, max_ticks):
+    names = [name for name, _ in settings]
+    grid = itertools.product(*[values for _, values in settings])
+    jobs = []
+    for combo in grid:
+        params = dict(zip(names, combo))
+        for policy in policies:
+            for game in range(games):
+                # Same seeds for every combination so they are compared on
+                # identical games
+                jobs.append((policy, seed + game, params, max_ticks))
+    return jobs
+
+def main():
+    parser = argparse.ArgumentParser(description="Run headless games in parallel for balancing")
+    parser.add_argument("--games", type=int, default=10, help="games per policy and parameter combination")
+    parser.add_argument("--policy", action="append", default=None,
+                        help=f"policy to play with, repeatable: {', '.join(POLICIES)} (default: weave)")
+    parser.add_argument("--set", action="append", default=[], metavar="NAME=V1,V2",
+                        help=f"sweep a parameter over values, repeatable: {', '.join(PARAMETERS)}")
+    parser.add_argument("--seed", type=int, default=1, help="seed of the first game")
+    parser.add_argument("--max-ticks", type=int, default=MAX_MINUTES * 60 * TICK_RATE,
+                        help="stop a game after this many ticks")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--out", help="write JSONL here instead of stdout")
+    args = parser.parse_args()
+
+    policies = args.policy or ["weave"]
+    unknown = [name for name in policies if name not in POLICIES]
+    if unknown:
+        parser.error(f"unknown policy: {', '.join(unknown)}")
+    settings = [parse_setting(parser, text) for text in args.set]
+    jobs = make_jobs(policies, settings, args.games, args.seed, args.max_ticks)
+
+    out = open(args.out, "w") if args.out else sys.stdout
+    start = time.perf_counter()
+    total_ticks = 0
+    try:
+        with ProcessPoolExecutor(max_workers=args.workers) as executor:
+            futures = [executor.submit(run_game, *job) for job in jobs]
+            for done, future in enumerate(as_completed(futures), 1):
+                result = future.result()
+                total_ticks += result["ticks"]
+                out.write(json.dumps(result) + "\n")
+                out.flush()
+                print(f"\r{done}/{len(jobs)} games", end="", file=sys.stderr)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    elapsed = time.perf_counter() - start
+    print(f"\n{len(jobs)} games, {total_ticks} ticks in {elapsed:.1f}s "
+          f"({total_ticks / elapsed:.0f} ticks/s over {args.workers or os.cpu_count()} workers)",
+          file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import time
+
+import pytest
+
+from netplay import Host, Client, Link, INPUT, INPUT_BODY, STATE, capture, encode_state, newer_game, packet
+from world import GameWorld, TICK_MS
+
+@pytest.fixture
+def session():
+    host = Host(GameWorld(1, players=2), 0, "127.0.0.1", Link())
+    client = Client(("127.0.0.1", host.port), Link())
+    yield host, client
+    host.sock.close()
+    client.sock.close()
+
+def run(host, client, ticks):
+    for _ in range(ticks):
+        client.poll()
+        client.update(TICK_MS)
+        client.send_input(0)
+        time.sleep(0.001)  # Let loopback datagrams land
+        host.tick(0)
+        time.sleep(0.001)
+    client.poll()
+
+def test_newer_game_wraps():
+    assert newer_game(1, 0)
+    assert newer_game(0, 255)
+    assert not newer_game(0, 0)
+    assert not newer_game(255, 0)
+    assert not newer_game(3, 4)
+
+def test_delayed_state_from_previous_game_is_ignored(session):
+    host, client = session
+    run(host, client, 20)
+    assert client.game == 0
+    old = packet(STATE, encode_state(0, host.world.ticks, capture(host.world), [])[0])
+
+    host.restart(GameWorld(2, players=2))
+    run(host, client, 5)
+    assert client.game == 1
+    states = dict(client.states)
+
+    host.sock.sendto(old, ("127.0.0.1", client.sock.getsockname()[1]))
+    time.sleep(0.01)
+    client.poll()
+    assert client.game == 1
+    assert client.states.keys() == states.keys()
+    run(host, client, 5)
+    assert client.undecodable == 0
+
+def test_ack_from_previous_game_is_not_a_baseline(session):
+    host, client = session
+    run(host, client, 20)
+    peer = next(iter(host.peers.values()))
+    old_tick = host.world.ticks
+
+    host.restart(GameWorld(2, players=2))
+    run(host, client, 3)
+    assert peer.acked < old_tick
+    stale = packet(INPUT, INPUT_BODY.pack(client.input_seq + 1, old_tick, 0, 0))
+    client.sock.sendto(stale, ("127.0.0.1", host.port))
+    time.sleep(0.01)
+    host.poll()
+    assert peer.acked < old_tick
@@ -0,0 +1,92 @@
+from scheduler import Scheduler
+
+def recorder():
+    fired = []
+    return fired, lambda name: fired.append(name)
+
+def test_runs_in_tick_then_schedule_order():
+    scheduler = Scheduler()
+    fired, fire = recorder()
+    scheduler.at(3, fire, "c")
+    scheduler.at(1, fire, "a")
+    scheduler.at(3, fire, "d")
+    scheduler.at(2, fire, "b")
+    scheduler.run_due(2)
+    assert fired == ["a", "b"]
+    scheduler.run_due(10)
+    assert fired == ["a", "b", "c", "d"]
+    assert len(scheduler) == 0
+
+def test_after_counts_from_now():
+    scheduler = Scheduler()
+    fired, fire = recorder()
+    scheduler.run_due(5)
+    scheduler.after(2, fire, "x")
+    scheduler.run_due(6)
+    assert fired == []
+    scheduler.run_due(7)
+    assert fired == ["x"]
+
+def test_cancel():
+    scheduler = Scheduler()
+    fired, fire = recorder()
+    keep = scheduler.at(1, fire, "keep")
+    drop = scheduler.at(1, fire, "drop")
+    scheduler.cancel(drop)
+    scheduler.cancel(drop)
+    scheduler.cancel(None)
+    assert len(scheduler) == 1
+    assert scheduler.pending() == [keep]
+    scheduler.run_due(1)
+    assert fired == ["keep"]
+    scheduler.cancel(keep)  # Already fired
+    assert len(scheduler) == 0
+
+def test_cancel_many_compacts():
+    scheduler = Scheduler()
+    handles = [scheduler.at(tick, print) for tick in range(200)]
+    for handle in handles[:150]:
+        scheduler.cancel(handle)
+    assert len(scheduler) == 50
+    assert len(scheduler.queue) < 200
+    assert scheduler.pending() == handles[150:]
+
+def test_callback_schedules_for_this_tick():
+    scheduler = Scheduler()
+    fired, fire = recorder()
+    scheduler.at(1, lambda: (fire("first"), scheduler.at(1, fire, "again")))
+    scheduler.at(2, fire, "later")
+    scheduler.run_due(1)
+    assert fired == ["first", "again"]
+
+def test_callback_cancels_pending_event():
+    scheduler = Scheduler()
+    fired, fire = recorder()
+    victim = scheduler.at(2, fire, "victim")
+    scheduler.at(1, scheduler.cancel, victim)
+    scheduler.run_due(5)
+    assert fired == []
+    assert len(scheduler) == 0
+
+def test_callback_cancelling_enough_to_compact():
+    # Compaction while run_due is popping must not bring back fired events
+    scheduler = Scheduler()
+    fired, fire = recorder()
+    later = [scheduler.at(tick, fire, tick) for tick in range(10, 110)]
+
+    def cancel_most():
+        fire("due5")
+        for handle in later[:80]:
+            scheduler.cancel(handle)
+    scheduler.at(5, cancel_most)
+    scheduler.at(6, fire, "due6")
+    assert len(scheduler) == 102
+
+    scheduler.run_due(6)
+    scheduler.run_due(6)
+    assert fired == ["due5", "due6"]
+    assert len(scheduler) == 20
+    scheduler.run_due(200)
+    assert fired == ["due5", "due6"] + list(range(90, 110))
+    assert len(scheduler) == 0
+    assert scheduler.cancelled == 0
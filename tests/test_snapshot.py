@@ -0,0 +1,36 @@
+import pytest
+
+from snapshot import snapshot, restore, fork, SnapshotError
+from sweep import weave
+from world import GameWorld
+
+def played(seed, ticks):
+    world = GameWorld(seed)
+    world.player.lives = 1000
+    for tick in range(ticks):
+        world.tick(weave(tick))
+    return world
+
+def test_fork_continues_identically():
+    world = played(1, 1200)
+    copy = fork(world)
+    for tick in range(600):
+        world.tick(weave(tick))
+        copy.tick(weave(tick))
+    assert snapshot(copy) == snapshot(world)
+
+def test_negative_seed():
+    world = GameWorld(-1)
+    assert snapshot(fork(world)) == snapshot(world)
+
+@pytest.mark.parametrize("corrupt", [
+    lambda data: data + b"\0",  # Trailing bytes
+    lambda data: data[:-1],  # Truncated
+    lambda data: data[:len(data) // 2],
+])
+def test_failed_restore_leaves_world_alone(corrupt):
+    world = played(2, 900)
+    before = snapshot(world)
+    with pytest.raises(SnapshotError):
+        restore(world, corrupt(snapshot(played(3, 1500))))
+    assert snapshot(world) == before
@@ -0,0 +1,7 @@
+from benchmarks.soak import soak
+
+def test_allocations_flat_after_warmup():
+    # A short soak; python -m benchmarks.soak runs the long one
+    world, failures = soak(6000, warmup=4000)
+    assert failures == []
+    assert world.ticks == 10000
@@ -0,0 +1,19 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import numpy as np
+
+from vecenv import VecEnv
+
+def rendered(seed):
+    env = VecEnv(2, seed=seed, frame_size=(160, 120))
+    env.reset()
+    for _ in range(30):
+        env.step(np.full(2, 0), render=True)
+    return [frame.copy() for frame in env.frames]
+
+def test_same_seed_same_pixels():
+    first = rendered(3)
+    second = rendered(3)
+    assert all(np.array_equal(a, b) for a, b in zip(first, second))
@@ -0,0 +1,91 @@
+import time
+from collections import deque
+
+# Per-phase frame timing. A GameWorld or Renderer only calls into a
+# PhaseTimer when one is attached, so instrumentation costs a single
+# attribute check per frame when profiling is off.
+
+clock = time.perf_counter
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+def stats(seconds):
+    # Mean and p50/p95/p99 of a list of durations, in milliseconds
+    values = sorted(v * 1000 for v in seconds)
+    return {
+        "mean": sum(values) / len(values) if values else 0.0,
+        "p50": percentile(values, 0.50),
+        "p95": percentile(values, 0.95),
+        "p99": percentile(values, 0.99),
+    }
+
+class PhaseTimer:
+    def __init__(self, history=None):
+        # history bounds how many frames are kept (None keeps all)
+        self.frames = deque(maxlen=history)
+        self.current = {}
+
+    def add(self, phase, seconds):
+        self.current[phase] = self.current.get(phase, 0.0) + seconds
+
+    def end_frame(self):
+        # Close the current frame; its total is the sum of its phases
+        frame = self.current
+        self.frames.append(frame)
+        self.current = {}
+        return frame
+
+    def clear(self):
+        self.frames.clear()
+        self.current = {}
+
+    def phase_names(self):
+        names = []
+        for frame in self.frames:
+            for name in frame:
+                if name not in names:
+                    names.append(name)
+        return names
+
+    def summary(self):
+        # Milliseconds: mean and p50/p95/p99 per phase and for whole frames
+        phases = {}
+        for name in self.phase_names():
+            phases[name] = stats([frame.get(name, 0.0) for frame in self.frames])
+        return {
+            "frames": len(self.frames),
+            "frame_ms": stats([sum(frame.values()) for frame in self.frames]),
+            "phases_ms": phases,
+        }
+
+class StartupTimer:
+    # Wall-clock startup phases, each timed from the end of the one before;
+    # background work is added with its own duration since it overlaps them
+    def __init__(self, start=None):
+        self.start = clock() if start is None else start
+        self.last = self.start
+        self.phases = []
+        self.background = []
+
+    def lap(self, phase):
+        now = clock()
+        self.phases.append((phase, now - self.last))
+        self.last = now
+
+    def add_background(self, phase, seconds):
+        self.background.append((phase, seconds))
+
+    def report(self):
+        lines = ["startup (ms)"]
+        for phase, seconds in self.phases:
+            lines.append(f"  {phase:<18}{seconds * 1000:8.1f}")
+        lines.append(f"  {'total':<18}{(self.last - self.start) * 1000:8.1f}")
+        if self.background:
+            lines.append("background (ms)")
+            for phase, seconds in self.background:
+                lines.append(f"  {phase:<18}{seconds * 1000:8.1f}")
+        return "\n".join(lines)
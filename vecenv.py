@@ -0,0 +1,188 @@
+import numpy as np
+import pygame
+
+from world import GameWorld, WIDTH, HEIGHT
+
+# Batched environment for training agents: K independent headless worlds
+# stepped in lockstep with one call, in the usual vector-env shape
+# (observations, rewards, dones, infos). Finished episodes reset
+# automatically.
+#
+# Observations are a float32 feature tensor of shape (K, FEATURE_SIZE),
+# reused between steps, and, when rendering, pixel frames: one
+# (width, height, 3) uint8 array per env that is a pygame.surfarray.pixels3d
+# view straight into an off-screen surface, so no pixels are copied. Each env alternates between two frame
+# surfaces, so a frame stays valid through the next render. Release (or
+# copy) it before the one after that, since a surface with a live view
+# cannot be drawn on.
+#
+#   env = VecEnv(8, seed=0)
+#   obs = env.reset()
+#   obs, rewards, dones, infos = env.step(actions)            # features only
+#   obs, rewards, dones, infos = env.step(actions, render=True)
+#   frames = env.frames                                       # K pixel views
+
+NEAREST_ENEMIES = 8
+NEAREST_BULLETS = 16
+PLAYER_FEATURES = 8  # x, y, health, shield, lives, rapid fire, multi shot, invincible
+BOSS_FEATURES = 4    # present, x, y, health fraction
+ENEMY_FEATURES = 6   # present, dx, dy to player, vx, vy, type
+BULLET_FEATURES = 5  # present, dx, dy to player, vx, vy
+FEATURE_SIZE = (PLAYER_FEATURES + BOSS_FEATURES
+                + NEAREST_ENEMIES * ENEMY_FEATURES + NEAREST_BULLETS * BULLET_FEATURES)
+
+def nearest_first(distance, k):
+    # Indices of the k smallest distances, closest first
+    if len(distance) > k:
+        nearest = np.argpartition(distance, k - 1)[:k]
+    else:
+        nearest = np.arange(len(distance))
+    return nearest[np.argsort(distance[nearest], kind="stable")]
+
+def write_features(world, out):
+    # Fill one env's row of the feature tensor. Positions are scaled to the
+    # screen, neighbours are relative to the player and nearest first;
+    # unused slots stay zero.
+    out[:] = 0
+    player = world.player
+    out[0:PLAYER_FEATURES] = (
+        player.x / WIDTH, player.y / HEIGHT, player.health / 100, player.shield / 100,
+        player.lives / 3, player.rapid_fire, player.multi_shot, player.invincible,
+    )
+    pos = PLAYER_FEATURES
+
+    boss = world.boss
+    if boss:
+        out[pos:pos + BOSS_FEATURES] = (1, boss.x / WIDTH, boss.y / HEIGHT, boss.health / boss.max_health)
+    pos += BOSS_FEATURES
+
+    enemies = world.enemies
+    n = enemies.count
+    if n:
+        dx = enemies.x[:n] - player.x
+        dy = enemies.y[:n] - player.y
+        nearest = nearest_first(dx * dx + dy * dy, NEAREST_ENEMIES)
+        k = len(nearest)
+        rows = out[pos:pos + k * ENEMY_FEATURES].reshape(k, ENEMY_FEATURES)
+        rows[:, 0] = 1
+        rows[:, 1] = dx[nearest] / WIDTH
+        rows[:, 2] = dy[nearest] / HEIGHT
+        rows[:, 3] = enemies.dx[nearest] / 5
+        rows[:, 4] = enemies.dy[nearest] / 5
+        rows[:, 5] = enemies.type[nearest] / 2
+    pos += NEAREST_ENEMIES * ENEMY_FEATURES
+
+    bullets = world.enemy_bullets
+    n = bullets.count
+    if n:
+        dx = bullets.x[:n] - player.x
+        dy = bullets.y[:n] - player.y
+        nearest = nearest_first(dx * dx + dy * dy, NEAREST_BULLETS)
+        k = len(nearest)
+        rows = out[pos:pos + k * BULLET_FEATURES].reshape(k, BULLET_FEATURES)
+        speed = bullets.speed[nearest] / 10
+        rows[:, 0] = 1
+        rows[:, 1] = dx[nearest] / WIDTH
+        rows[:, 2] = dy[nearest] / HEIGHT
+        rows[:, 3] = bullets.dx[nearest] * speed
+        rows[:, 4] = bullets.dy[nearest] * speed
+
+class VecEnv:
+    def __init__(self, num_envs, seed=0, frame_skip=1, max_ticks=None, frame_size=None):
+        # frame_skip: ticks each action is held for. max_ticks: truncate
+        # episodes. frame_size: (width, height) to scale pixel frames to.
+        self.num_envs = num_envs
+        self.seed = seed
+        self.frame_skip = frame_skip
+        self.max_ticks = max_ticks
+        self.frame_size = frame_size or (WIDTH, HEIGHT)
+        self.episodes = 0
+        self.worlds = [None] * num_envs
+        self.features = np.zeros((num_envs, FEATURE_SIZE), dtype=np.float32)
+
+        # Pixel rendering is set up on first use
+        self.renderers = None
+        self.canvases = None
+        self.targets = None
+        self.frames = None
+        self.flip = 0
+
+    def new_world(self):
+        # Episodes get consecutive seeds, so a run is reproducible
+        world = GameWorld(self.seed + self.episodes)
+        self.episodes += 1
+        return world
+
+    def reset(self):
+        for i in range(self.num_envs):
+            self.worlds[i] = self.new_world()
+            write_features(self.worlds[i], self.features[i])
+        return self.features
+
+    def step(self, actions, render=False):
+        # actions: one INPUT_* bitmask per env. Rewards are score gained;
+        # an env whose episode ended returns done=True and has already been
+        # reset (its final features are in info["final_features"]).
+        rewards = np.zeros(self.num_envs, dtype=np.float32)
+        dones = np.zeros(self.num_envs, dtype=bool)
+        infos = []
+        for i, world in enumerate(self.worlds):
+            inputs = int(actions[i])
+            score = world.score
+            for _ in range(self.frame_skip):
+                world.tick(inputs)
+                if world.game_over:
+                    break
+            rewards[i] = world.score - score
+            info = {"score": world.score, "level": world.level,
+                    "lives": world.player.lives, "ticks": world.ticks}
+            if world.game_over or (self.max_ticks and world.ticks >= self.max_ticks):
+                dones[i] = True
+                info["truncated"] = not world.game_over
+                write_features(world, self.features[i])
+                info["final_features"] = self.features[i].copy()
+                world = self.worlds[i] = self.new_world()
+            write_features(world, self.features[i])
+            infos.append(info)
+        if render:
+            self.render()
+        return self.features, rewards, dones, infos
+
+    def setup_rendering(self):
+        from render import Renderer
+
+        pygame.font.init()
+        full_size = (WIDTH, HEIGHT)
+        self.targets = [[pygame.Surface(self.frame_size, 0, 32) for _ in range(2)]
+                        for _ in range(self.num_envs)]
+        if self.frame_size == full_size:
+            # Draw straight into the frame surfaces
+            self.canvases = None
+            self.renderers = [Renderer(self.targets[i][0], star_seed=self.seed) for i in range(self.num_envs)]
+        else:
+            self.canvases = [pygame.Surface(full_size, 0, 32) for _ in range(self.num_envs)]
+            self.renderers = [Renderer(canvas, star_seed=self.seed) for canvas in self.canvases]
+
+    def render(self):
+        # Draw every world and expose the results as pixel views in
+        # self.frames (also returned)
+        if self.renderers is None:
+            self.setup_rendering()
+        flip = self.flip ^ 1
+        if any(targets[flip].get_locked() for targets in self.targets):
+            raise RuntimeError("a pixel frame from two renders ago is still referenced; "
+                               "copy frames that need to outlive the next render")
+        self.flip = flip
+        frames = []
+        for i, world in enumerate(self.worlds):
+            target = self.targets[i][flip]
+            renderer = self.renderers[i]
+            if self.canvases is None:
+                renderer.screen = target
+            renderer.update(world)
+            renderer.draw(world, 1.0)
+            if self.canvases is not None:
+                pygame.transform.smoothscale(self.canvases[i], self.frame_size, target)
+            frames.append(pygame.surfarray.pixels3d(target))
+        self.frames = frames
+        return frames
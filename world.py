@@ -0,0 +1,742 @@
+import random
+import math
+
+import numpy as np
+
+from bullets import BulletPool, OWNER_BOSS
+from enemies import EnemyArray, ENEMY_SIZE
+from particles import ParticleSystem
+from patterns import attack
+from spatial import SpatialHash
+from pool import Pool
+from scheduler import Scheduler
+from timing import clock
+
+# Simulation core. Nothing in here touches the display, the mixer or the
+# frame clock, so a GameWorld can be stepped headlessly as fast as the CPU
+# allows (bots, soak tests, balancing runs). game.py drives it interactively.
+
+WIDTH, HEIGHT = 800, 600
+
+# Input bitmask passed to GameWorld.step
+INPUT_LEFT = 1
+INPUT_RIGHT = 2
+INPUT_UP = 4
+INPUT_DOWN = 8
+INPUT_FIRE = 16
+
+# Fixed simulation timestep. Movement speeds are per tick and timers are
+# driven by the tick counter, so a run is a pure function of seed + inputs
+# no matter how fast it is rendered.
+TICK_RATE = 60
+TICK_MS = 1000 / TICK_RATE
+MAX_FRAME_MS = 250  # Longest real frame step() catches up on before dropping time
+EXPLOSION_FRAMES = 8
+MAX_BULLET_SIZE = 5  # Widens broadphase queries so edge-of-cell bullets are found
+GRID_CELL_SIZE = 64
+BULLET_CAPACITY = 16384
+MAX_PARTICLES = 4096
+GRID_FILTER_MIN = 64  # Enemy count from which update_enemies pre-filters by occupied cells
+BOSS_BULLET_DAMAGE = 10
+BOSS_ENTRY_Y = 100  # The boss slides down to here before it starts firing
+BOSS_VOLLEY_TICKS = 30  # Half a second between volleys, each with the next pattern
+BOSS_BULLET_SPEED = 5  # Boss bullets are slower
+BOSS_ATTACKS = ("spread", "aimed", "spiral")  # Pattern cycle (patterns.py)
+# Bullet hell: an endless boss fight cycling every pattern, ramping from
+# the normal boss to HELL_MAX_DENSITY times the shots every
+# HELL_MIN_VOLLEY_TICKS, which keeps thousands of projectiles in the air
+HELL_ATTACKS = ("spread", "aimed", "spiral", "rings", "waves")
+HELL_RAMP_TICKS = 3 * 60 * TICK_RATE
+HELL_MAX_DENSITY = 8
+HELL_MIN_VOLLEY_TICKS = 2
+POWERUP_TYPES = ("shield", "rapid", "multi")
+
+def ms_to_ticks(ms):
+    # Durations are tuned in ms; the scheduler counts whole ticks
+    return max(1, round(ms * TICK_RATE / 1000))
+
+class Player:
+    def __init__(self, index=0, x=WIDTH // 2):
+        self.index = index
+        self.width = 50
+        self.height = 50
+        self.x = x
+        self.y = HEIGHT - 100
+        self.prev_x = self.x
+        self.prev_y = self.y
+        self.speed = 7
+        self.health = 100
+        self.lives = 3
+        self.shield = 0
+        self.rapid_fire = False
+        self.multi_shot = False
+        self.invincible = False
+        self.last_bullet_time = 0
+        # Scheduler handles of this player's timed effects
+        self.power_up_handle = None
+        self.invincible_handle = None
+
+    @property
+    def alive(self):
+        return self.lives > 0
+
+    def move(self, dx, dy):
+        self.prev_x = self.x
+        self.prev_y = self.y
+        self.x = max(self.width//2, min(WIDTH - self.width//2, self.x + dx))
+        self.y = max(self.height//2, min(HEIGHT - self.height//2, self.y + dy))
+
+    def shoot(self, current_time):
+        # Returns (x, y, dx, dy) for each new bullet
+        if self.multi_shot:
+            return [
+                (self.x, self.y - self.height//2, 0, -1),
+                (self.x - 10, self.y - self.height//2, -0.3, -0.7),
+                (self.x + 10, self.y - self.height//2, 0.3, -0.7)
+            ]
+        else:
+            return [(self.x, self.y - self.height//2, 0, -1)]
+
+    def hit(self, damage):
+        if self.invincible:
+            return False
+
+        if self.shield > 0:
+            self.shield -= damage
+            if self.shield < 0:
+                self.shield = 0
+            return False
+
+        self.health -= damage
+        if self.health <= 0:
+            self.lives -= 1
+            if self.lives > 0:
+                self.health = 100
+                self.invincible = True
+            return self.lives <= 0
+        return False
+
+class Boss:
+    def __init__(self, level, health_per_level=500):
+        self.width = 100
+        self.height = 100
+        self.x = WIDTH // 2
+        self.y = -self.height
+        self.prev_x = self.x
+        self.prev_y = self.y
+        self.health = health_per_level * level
+        self.max_health = self.health
+        self.level = level
+        self.dx = 3
+        self.pattern = 0  # Index into the world's attack cycle
+        self.volleys = 0  # Volleys fired; turns spirals, sways waves
+
+    def move(self):
+        self.prev_x = self.x
+        self.prev_y = self.y
+
+        # Boss enters the screen
+        if self.y < BOSS_ENTRY_Y:
+            self.y += 1
+            return
+
+        # Move side to side
+        self.x += self.dx
+        if self.x < self.width//2 or self.x > WIDTH - self.width//2:
+            self.dx *= -1
+
+    def entry_ticks(self):
+        # Ticks of move() left before the boss is in place
+        return max(0, math.ceil(BOSS_ENTRY_Y - self.y))
+
+    def hit(self, damage):
+        self.health -= damage
+        return self.health <= 0
+
+class PowerUp:
+    __slots__ = ("type", "x", "y", "prev_x", "prev_y", "speed", "width", "height")
+
+    def __init__(self, x, y, rng=random):
+        self.speed = 2
+        self.width = 30
+        self.height = 30
+        self.reset(x, y, rng)
+
+    def reset(self, x, y, rng=random):
+        self.type = rng.choice(POWERUP_TYPES)
+        self.x = x
+        self.y = y
+        self.prev_x = x
+        self.prev_y = y
+
+    def move(self):
+        self.prev_y = self.y
+        self.y += self.speed
+
+    def off_screen(self):
+        return self.y > HEIGHT + 20
+
+class Explosion:
+    __slots__ = ("x", "y", "frame", "size", "max_frame")
+
+    def __init__(self, x, y, size=1.0):
+        self.reset(x, y, size)
+
+    def reset(self, x, y, size=1.0):
+        self.x = x
+        self.y = y
+        self.frame = 0
+        self.size = size
+        self.max_frame = EXPLOSION_FRAMES - 1
+
+    def update(self):
+        self.frame += 0.5
+        return self.frame > self.max_frame
+
+class GameWorld:
+    def __init__(self, seed=None, max_particles=MAX_PARTICLES, players=1, bullet_hell=False):
+        # Every random decision in the simulation goes through self.rng
+        if seed is None:
+            seed = random.randrange(2**32)
+        seed %= 2**64  # Snapshots and replays store it as a u64
+        self.seed = seed
+        self.rng = random.Random(seed)
+
+        # Co-op: players share the score and the game ends when all of them
+        # are out. self.player is the first (and usually only) one.
+        self.players = [Player(i, WIDTH * (i + 1) // (players + 1)) for i in range(players)]
+        self.player = self.players[0]
+        self.enemies = EnemyArray()
+        self.boss = None
+        self.power_ups = []
+        self.explosions = []
+        self.particle_system = ParticleSystem(max_particles)
+        self.bullets = BulletPool(BULLET_CAPACITY)
+        self.bullet_grid = SpatialHash(GRID_CELL_SIZE)
+        # Hostile projectiles live in their own pool: they are only ever
+        # tested against the player, never against enemies or the boss
+        self.enemy_bullets = BulletPool(BULLET_CAPACITY)
+
+        # Power-ups and explosions are recycled through pools; the live lists
+        # are compacted in place so removal never shifts per item
+        self.power_up_pool = Pool(PowerUp)
+        self.explosion_pool = Pool(Explosion)
+
+        # Game state
+        self.score = 0
+        self.level = 1
+        self.game_over = False
+        self.boss_fight = False
+        self.boss_killed = False
+        self.bullet_hell = bullet_hell
+        self.enemy_spawn_rate = 1000  # ms
+
+        # Balancing knobs (see sweep.py); the defaults are the shipped game
+        self.spawn_rate_base = 1000  # ms, shortened by 50 per level
+        self.spawn_rate_floor = 300  # ms
+        self.boss_health_per_level = 500
+        self.power_up_chance = 0.2
+        self.fire_rate = 300  # ms between shots
+        self.rapid_fire_rate = 150  # ms between shots with rapid fire
+        self.hell_ramp_ticks = HELL_RAMP_TICKS  # Bullet hell reaches full intensity after this
+
+        # Simulation clock: whole ticks, the same clock in ms, and real time
+        # not yet simulated
+        self.ticks = 0
+        self.time = 0
+        self.accumulator = 0
+        self.alpha = 0  # Fraction of a tick the last step() left over, for interpolation
+
+        # Everything that happens after a delay (spawns, power-up expiry,
+        # end of invincibility, level transitions, boss volleys) is an event
+        # on the tick scheduler, holding its handle here so it can be moved
+        # or cancelled. Nothing polls a timer per tick.
+        self.scheduler = Scheduler()
+        self.spawn_handle = None
+        self.spawn_paused = None  # Ticks left on the spawn timer while a boss is up
+        self.level_handle = None
+        self.boss_handle = None
+        self.set_spawn_rate(self.enemy_spawn_rate)
+
+        # Sound cues raised during the last step ("shoot", "explosion", "powerup")
+        self.events = []
+        self.inputs = (0,) * players  # Input bitmask of each player this tick
+
+        # One tick runs these in order. The names group them for profiling:
+        # attach a timing.PhaseTimer as self.timer to time each phase.
+        self.phases = [
+            ("events", self.run_events),
+            ("input", self.update_player),
+            ("bullets", self.update_bullets),
+            ("boss", self.update_boss),
+            ("enemies", self.update_enemies),
+            ("boss", self.update_boss_collisions),
+            ("bullets", self.update_player_hits),
+            ("power_ups", self.update_power_ups),
+            ("particles", self.update_effects),
+        ]
+        self.timer = None
+
+    def step(self, inputs, dt=TICK_MS):
+        # Advance by dt ms of real time with a fixed-timestep accumulator:
+        # runs as many whole ticks as fit, keeps the remainder for the next
+        # call and returns the number of ticks run. inputs is a bitmask of
+        # INPUT_* flags held for all of them (a sequence of bitmasks, one
+        # per player, in co-op), or a callable returning that for each tick
+        # (replay playback).
+        self.accumulator += min(dt, MAX_FRAME_MS)
+        events = []
+        ticks = 0
+        while self.accumulator >= TICK_MS:
+            self.accumulator -= TICK_MS
+            self.tick(inputs() if callable(inputs) else inputs)
+            events.extend(self.events)
+            ticks += 1
+        self.events = events
+        self.alpha = self.accumulator / TICK_MS
+        return ticks
+
+    def tick(self, inputs):
+        # Advance the simulation by exactly one fixed tick. inputs is the
+        # first player's bitmask or a sequence with one per player.
+        self.events = []
+        if self.game_over:
+            return
+
+        self.ticks += 1
+        self.time = self.ticks * TICK_MS
+        self.inputs = (inputs,) if isinstance(inputs, int) else inputs
+        timer = self.timer
+        if timer is None:
+            for name, phase in self.phases:
+                phase()
+        else:
+            for name, phase in self.phases:
+                start = clock()
+                phase()
+                timer.add(name, clock() - start)
+
+    def run_events(self):
+        self.scheduler.run_due(self.ticks)
+
+    def set_spawn_rate(self, rate):
+        # Change the enemy spawn interval (ms), restarting the countdown
+        self.enemy_spawn_rate = rate
+        if self.boss_fight:
+            self.spawn_paused = ms_to_ticks(rate)
+            return
+        self.scheduler.cancel(self.spawn_handle)
+        self.spawn_handle = self.scheduler.after(ms_to_ticks(rate), self.spawn_enemy)
+
+    def spawn_enemy(self):
+        # Random enemy type based on level
+        enemy_type = self.rng.randint(0, min(self.level - 1, 2))
+        self.enemies.spawn(enemy_type, self.rng, WIDTH)
+
+        # Increase difficulty as level increases
+        self.set_spawn_rate(max(self.spawn_rate_floor, self.spawn_rate_base - self.level * 50))
+
+    def end_power_ups(self, index):
+        player = self.players[index]
+        player.rapid_fire = False
+        player.multi_shot = False
+        player.power_up_handle = None
+
+    def end_invincibility(self, index):
+        player = self.players[index]
+        player.invincible = False
+        player.invincible_handle = None
+
+    def next_level(self):
+        self.level += 1
+        self.boss_killed = False
+        self.level_handle = None
+
+    def hit_player(self, player, damage):
+        # Returns True if this took the player's last life
+        lives = player.lives
+        if player.hit(damage):
+            self.game_over = not any(other.alive for other in self.players)
+            return True
+        if player.lives < lives:
+            # Lost a life: 2 seconds of invincibility
+            self.scheduler.cancel(player.invincible_handle)
+            player.invincible_handle = self.scheduler.after(ms_to_ticks(2000), self.end_invincibility, player.index)
+        return False
+
+    def active_players(self):
+        # Players that can still collide. A lone player always counts: its
+        # game ends with the tick it dies in.
+        players = self.players
+        if len(players) == 1:
+            return players
+        return [player for player in players if player.alive] or players
+
+    def nearest_player(self, x, y):
+        # Closest active player (the boss aims at it)
+        players = self.active_players()
+        if len(players) == 1:
+            return players[0]
+        return min(players, key=lambda player: (player.x - x)**2 + (player.y - y)**2)
+
+    def homing_targets(self, players):
+        # x homing enemies steer towards: the player's, or in co-op each
+        # enemy's nearest player's
+        if len(players) == 1:
+            return players[0].x
+        n = self.enemies.count
+        px = np.array([player.x for player in players])
+        py = np.array([player.y for player in players])
+        dx = self.enemies.x[:n, None] - px
+        dy = self.enemies.y[:n, None] - py
+        return px[(dx * dx + dy * dy).argmin(axis=1)]
+
+    def update_player(self):
+        for player, inputs in zip(self.players, self.inputs):
+            if player.alive:
+                self.update_one_player(player, inputs)
+
+    def update_one_player(self, player, inputs):
+        current_time = self.time
+        rng = self.rng
+
+        # Player movement
+        dx = 0
+        dy = 0
+        if inputs & INPUT_LEFT:
+            dx -= player.speed
+        if inputs & INPUT_RIGHT:
+            dx += player.speed
+        if inputs & INPUT_UP:
+            dy -= player.speed
+        if inputs & INPUT_DOWN:
+            dy += player.speed
+
+        # Apply diagonal speed limit
+        if dx != 0 and dy != 0:
+            dx *= 0.7071  # 1/sqrt(2)
+            dy *= 0.7071
+
+        player.move(dx, dy)
+
+        # Shooting
+        if inputs & INPUT_FIRE:
+            # Determine fire rate
+            fire_rate = self.rapid_fire_rate if player.rapid_fire else self.fire_rate
+
+            # Check cooldown
+            if current_time - player.last_bullet_time > fire_rate:
+                for x, y, dx, dy in player.shoot(current_time):
+                    self.bullets.spawn(x, y, dx, dy)
+                player.last_bullet_time = current_time
+                self.events.append("shoot")
+
+                # Add muzzle flash particle effect
+                for _ in range(5):
+                    dx = rng.uniform(-1, 1)
+                    dy = rng.uniform(-2, 0)
+                    self.particle_system.add_particle(
+                        player.x, player.y - player.height//2,
+                        (255, 255, 150), rng.uniform(2, 5),
+                        rng.randint(10, 20), dx, dy
+                    )
+
+    def update_bullets(self):
+        self.bullets.move()
+        self.bullets.cull(WIDTH, HEIGHT)
+        self.enemy_bullets.move()
+        self.enemy_bullets.cull(WIDTH, HEIGHT)
+
+    def update_boss(self):
+        # Check if it's time for boss (always, in bullet hell)
+        if not self.boss_fight and (self.bullet_hell or self.score >= self.level * 1000):
+            self.enemies.clear()  # Clear normal enemies
+            self.start_boss(Boss(self.level, self.boss_health_per_level))
+
+        # Update boss if active
+        if self.boss:
+            self.boss.move()
+
+    def start_boss(self, boss):
+        # Pause enemy spawns for the fight and hold fire until the boss has
+        # finished entering
+        scheduler = self.scheduler
+        if not self.boss_fight and self.spawn_handle is not None:
+            self.spawn_paused = max(1, self.spawn_handle.tick - scheduler.now)
+            scheduler.cancel(self.spawn_handle)
+            self.spawn_handle = None
+        self.boss_fight = True
+        self.boss = boss
+        scheduler.cancel(self.boss_handle)
+        self.boss_handle = scheduler.after(max(1, boss.entry_ticks()), self.boss_volley)
+
+    def hell_progress(self):
+        # 0 to 1 over the bullet hell ramp; always 0 in the normal game
+        if not self.bullet_hell:
+            return 0.0
+        return min(1.0, self.ticks / self.hell_ramp_ticks)
+
+    def boss_volley(self):
+        # Fire the boss's current pattern as one batch, then move on to the
+        # next pattern in the cycle
+        boss = self.boss
+        attacks = HELL_ATTACKS if self.bullet_hell else BOSS_ATTACKS
+        progress = self.hell_progress()
+        pattern = attack(attacks[boss.pattern % len(attacks)], 1 + int(progress * (HELL_MAX_DENSITY - 1)))
+
+        aim = (0.0, 1.0)
+        if pattern.dx is None:
+            player = self.nearest_player(boss.x, boss.y)
+            distance = math.sqrt((player.x - boss.x)**2 + (player.y - boss.y)**2)
+            if distance:
+                aim = ((player.x - boss.x) / distance, (player.y - boss.y) / distance)
+        x, y, dx, dy = pattern.volley(boss.x, boss.y + boss.height//2, boss.volleys, aim)
+        self.enemy_bullets.spawn_many(x, y, dx, dy, speed=BOSS_BULLET_SPEED, owner=OWNER_BOSS)
+        n = pattern.count
+        self.particle_system.add_particles(x, y, (255, 100, 100), np.full(n, 3), np.full(n, 10), dx * 0.5, dy * 0.5)
+
+        boss.pattern = (boss.pattern + 1) % len(attacks)
+        boss.volleys += 1
+        ticks = round(BOSS_VOLLEY_TICKS + (HELL_MIN_VOLLEY_TICKS - BOSS_VOLLEY_TICKS) * progress)
+        self.boss_handle = self.scheduler.after(ticks, self.boss_volley)
+
+    def update_enemies(self):
+        # Broadphase: bin bullets once, then every collider only looks at
+        # the cells around it
+        bullets = self.bullets
+        if bullets.count:
+            self.bullet_grid.rebuild(bullets.x[:bullets.count], bullets.y[:bullets.count])
+        else:
+            self.bullet_grid.clear()
+
+        enemies = self.enemies
+        n = enemies.count
+        if not n:
+            return
+        players = self.active_players()
+        enemies.move(self.homing_targets(players), WIDTH)
+        keep = ~enemies.off_screen(HEIGHT)
+
+        # Enemies touching a player or near bullets get a closer look, one
+        # by one in order. Large crowds are pre-filtered with vectorized
+        # distance and occupied-cell tests first; for a handful of enemies
+        # that costs more than it saves.
+        radius = ENEMY_SIZE / 2
+        reach = (ENEMY_SIZE + self.player.width) / 2
+        grid = self.bullet_grid
+        if n >= GRID_FILTER_MIN:
+            x = enemies.x[:n]
+            y = enemies.y[:n]
+            near = grid.touches(x, y, radius + MAX_BULLET_SIZE)
+            for player in players:
+                dx = x - player.x
+                dy = y - player.y
+                near |= dx * dx + dy * dy < reach * reach
+            candidates = (keep & near).nonzero()[0].tolist()
+        else:
+            candidates = keep.nonzero()[0].tolist()
+        if not candidates:
+            enemies.remove(keep)
+            return
+
+        xs = enemies.x[:n].tolist()
+        ys = enemies.y[:n].tolist()
+        for i in candidates:
+            x = xs[i]
+            y = ys[i]
+
+            # Enemy-player collision
+            touched = None
+            for player in players:
+                dx = x - player.x
+                dy = y - player.y
+                if dx * dx + dy * dy < reach * reach:
+                    touched = player
+                    break
+            if touched is not None:
+                self.hit_player(touched, 20)
+
+                self.spawn_explosion(x, y)
+                self.events.append("explosion")
+                keep[i] = False
+                continue
+
+            # Enemy-bullet collision
+            nearby = grid.query(x, y, radius + MAX_BULLET_SIZE)
+            if len(nearby):
+                dx = bullets.x[nearby] - x
+                dy = bullets.y[nearby] - y
+                reach_bullet = radius + bullets.size[nearby]
+                hits = nearby[bullets.alive[nearby] & (dx * dx + dy * dy < reach_bullet * reach_bullet)]
+                if len(hits):
+                    enemy = enemies[i]
+                    if self.hit_with_bullets(enemy, hits):
+                        self.kill_enemy(enemy)
+                        keep[i] = False
+
+        # Order-preserving compaction keeps collision order (and so replays)
+        # the same as spawn order
+        enemies.remove(keep)
+
+    def kill_enemy(self, enemy):
+        self.score += (enemy.type + 1) * 10
+        self.spawn_explosion(enemy.x, enemy.y)
+
+        # Chance to drop power-up
+        if self.rng.random() < self.power_up_chance:
+            self.power_ups.append(self.power_up_pool.acquire(enemy.x, enemy.y, self.rng))
+
+        self.events.append("explosion")
+
+        # Add particle effects
+        self.burst(enemy.x, enemy.y, 10, (1, 3), (255, 200, 50), (2, 5), (20, 40))
+
+    def hit_with_bullets(self, target, hits):
+        # Bullets hit one at a time until the target dies; the rest fly on.
+        # Returns True if the target was killed.
+        for used in range(1, len(hits) + 1):
+            if target.hit(10):
+                self.bullets.alive[hits[:used]] = False
+                return True
+        self.bullets.alive[hits] = False
+        return False
+
+    def update_boss_collisions(self):
+        if self.boss:
+            self.collide_boss()
+
+        # Drop every bullet that hit something this tick
+        self.bullets.compact()
+
+    def update_player_hits(self):
+        # One vectorized test of every hostile bullet against each player's
+        # circle; each hit goes through Player.hit (shield, invincibility)
+        bullets = self.enemy_bullets
+        for player in self.active_players():
+            n = bullets.count
+            if not n:
+                return
+            dx = bullets.x[:n] - player.x
+            dy = bullets.y[:n] - player.y
+            reach = player.width / 2 + bullets.size[:n]
+            hits = (bullets.alive[:n] & (dx * dx + dy * dy < reach * reach)).nonzero()[0]
+            if not len(hits):
+                continue
+
+            bullets.alive[hits] = False
+            bullets.compact()
+            for _ in range(len(hits)):
+                if self.hit_player(player, BOSS_BULLET_DAMAGE):
+                    break
+            self.burst(player.x, player.y, 5, (1, 3), (255, 100, 100), (2, 4), (10, 20))
+
+    def collide_boss(self):
+        boss = self.boss
+        bullets = self.bullets
+        half_w = boss.width//2
+        half_h = boss.height//2
+        nearby = self.bullet_grid.query(boss.x, boss.y, max(half_w, half_h))
+        if not len(nearby):
+            return
+        x = bullets.x[nearby]
+        y = bullets.y[nearby]
+        inside = ((boss.x - half_w <= x) & (x <= boss.x + half_w) &
+                  (boss.y - half_h <= y) & (y <= boss.y + half_h))
+        hits = nearby[bullets.alive[nearby] & inside]
+        if len(hits) and self.hit_with_bullets(boss, hits):
+            self.score += self.level * 500
+            self.spawn_explosion(boss.x, boss.y, 2.0)
+            self.end_boss()
+            self.events.append("explosion")
+
+            # Lots of particles!
+            self.burst(boss.x, boss.y, 50, (1, 5), (255, 100, 50), (3, 8), (30, 60))
+
+    def end_boss(self):
+        # Stop the volleys, resume spawning where it paused and move on to
+        # the next level in 5 seconds
+        scheduler = self.scheduler
+        scheduler.cancel(self.boss_handle)
+        self.boss_handle = None
+        self.boss = None
+        self.boss_killed = True
+        self.boss_fight = False
+        if self.spawn_paused is not None:
+            self.spawn_handle = scheduler.after(self.spawn_paused, self.spawn_enemy)
+            self.spawn_paused = None
+        scheduler.cancel(self.level_handle)
+        self.level_handle = scheduler.after(ms_to_ticks(5000), self.next_level)
+
+    def update_effects(self):
+        # Update explosions
+        explosions = self.explosions
+        kept = 0
+        for explosion in explosions:
+            if explosion.update():
+                self.explosion_pool.release(explosion)
+            else:
+                explosions[kept] = explosion
+                kept += 1
+        del explosions[kept:]
+
+        # Update particles
+        self.particle_system.update()
+
+    def spawn_explosion(self, x, y, size=1.0):
+        self.explosions.append(self.explosion_pool.acquire(x, y, size))
+
+    def update_power_ups(self):
+        players = self.active_players()
+        power_ups = self.power_ups
+        kept = 0
+        for power_up in power_ups:
+            power_up.move()
+            if power_up.off_screen():
+                self.power_up_pool.release(power_up)
+                continue
+            player = None
+            for candidate in players:
+                if ((power_up.x - candidate.x)**2 + (power_up.y - candidate.y)**2 <
+                        ((power_up.width + candidate.width) / 2)**2):
+                    player = candidate
+                    break
+            if player is not None:
+                if power_up.type == "shield":
+                    player.shield = 100
+                elif power_up.type == "rapid":
+                    player.rapid_fire = True
+                    self.extend_power_ups(player, 10000)  # 10 seconds
+                elif power_up.type == "multi":
+                    player.multi_shot = True
+                    self.extend_power_ups(player, 8000)  # 8 seconds
+
+                self.power_up_pool.release(power_up)
+                self.events.append("powerup")
+
+                # Add particles
+                self.burst(player.x, player.y, 20, (1, 3), (100, 255, 100), (2, 5), (20, 40))
+            else:
+                power_ups[kept] = power_up
+                kept += 1
+        del power_ups[kept:]
+
+    def burst(self, x, y, count, speed_range, color, size_range, life_range):
+        # Radial particle spray used for kills and pickups
+        rng = self.rng
+        sizes = []
+        lives = []
+        dxs = []
+        dys = []
+        for _ in range(count):
+            angle = rng.uniform(0, 2 * math.pi)
+            speed = rng.uniform(*speed_range)
+            dxs.append(math.cos(angle) * speed)
+            dys.append(math.sin(angle) * speed)
+            sizes.append(rng.uniform(*size_range))
+            lives.append(rng.randint(*life_range))
+        self.particle_system.add_particles(x, y, color, sizes, lives, dxs, dys)
+
+    def extend_power_ups(self, player, ms):
+        # Rapid fire and multi shot share one expiry, restarted by each pickup
+        self.scheduler.cancel(player.power_up_handle)
+        player.power_up_handle = self.scheduler.after(ms_to_ticks(ms), self.end_power_ups, player.index)